@@ -2,6 +2,11 @@
 Application settings and configuration
 """
 
+import os
+
+# Project-level cache directory, independent of the working directory
+CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache')
+
 class Colors:
     """Color scheme for the application"""
     PRIMARY = '#3498db'
@@ -28,6 +33,10 @@ class Fonts:
     HEADING = ('Helvetica', 12, 'bold')
     BODY = ('Helvetica', 10)
     MONOSPACE = ('Courier', 10)
+    
+    # Named Tk fonts registered once at startup from the tuples above
+    BODY_NAME = 'DashBody'
+    HEADING_NAME = 'DashHeading'
 
 class Settings:
     """Application settings"""
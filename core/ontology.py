@@ -4,17 +4,75 @@ Core ontology management classes
 
 from rdflib import Graph, Namespace, URIRef, Literal, RDF, RDFS, OWL, XSD
 from rdflib.namespace import FOAF
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from functools import lru_cache
 import logging
+import os
+import shutil
+import subprocess
+import tempfile
+
+try:
+    import oxrdflib  # registers the "Oxigraph" rdflib store plugin
+    OXIGRAPH_AVAILABLE = True
+except ImportError:
+    OXIGRAPH_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# rdflib parser names by file extension
+FORMAT_BY_EXTENSION = {
+    '.ttl': 'turtle',
+    '.turtle': 'turtle',
+    '.nt': 'nt',
+    '.n3': 'n3',
+    '.rdf': 'xml',
+    '.owl': 'xml',
+    '.xml': 'xml',
+    '.jsonld': 'json-ld',
+    '.json': 'json-ld',
+    '.trig': 'trig',
+    '.nq': 'nquads'
+}
+
+# Formats the Oxigraph store can parse natively with its Rust parsers
+OXIGRAPH_FORMATS = {'turtle': 'ox-turtle', 'nt': 'ox-nt', 'xml': 'ox-xml'}
+
+# Turtle files above this size are converted with rapper (raptor2) when
+# Oxigraph is not available, since rdflib's Turtle parser is far slower
+RAPPER_MIN_SIZE = 10 * 1024 * 1024
+
 class UniversityOntology:
-    """University Management Ontology"""
+    """University Management Ontology
+    
+    The graph is backed by Oxigraph (via oxrdflib) when it is installed, since
+    its native indexes and query planner make SPARQL much faster on larger
+    ontologies. Every term still crosses the Rust/Python boundary, so for small
+    ontologies the pure Python store can be requested with store="default".
+    """
     
-    def __init__(self, namespace=None):
-        self.graph = Graph()
+    def __init__(self, namespace=None, store=None):
+        if store is None:
+            store = "Oxigraph" if OXIGRAPH_AVAILABLE else "default"
+        self.graph = Graph(store=store)
         self.namespace = namespace or "http://www.semanticweb.org/khaled/ontologies/2024/university-management#"
         self.univ_ns = Namespace(self.namespace)
+        # Statistics maintained incrementally by the mutation methods;
+        # _counts_version is the version they were last known to match
+        self._counts = {}
+        self._counts_version = -1
+        self._hierarchy_cache = None
+        self._batch_depth = 0
+        # Bumped on every mutation so callers can cache derived values
+        self.version = 0
+        # Cached URI construction for names that are looked up repeatedly
+        self._uri = lru_cache(maxsize=4096)(self.univ_ns.term)
+        self._class_uri = {}
+        self._prop_uri = {}
+        # Materialized results keyed by (query, version), so a mutation
+        # makes every older entry unreachable
+        self._cached_query = lru_cache(maxsize=256)(self._materialized_query)
         self.init_ontology()
         
     def init_ontology(self):
@@ -30,6 +88,8 @@ class UniversityOntology:
         self._define_classes()
         # Define properties
         self._define_properties()
+        self.version += 1
+        self._reset_counts()
         
     def _define_classes(self):
         """Define ontology classes"""
@@ -58,10 +118,12 @@ class UniversityOntology:
             ("Conference", "Academic conference")
         ]
         
+        quads = []
         for class_name, comment in classes:
-            class_uri = self.univ_ns[class_name]
-            self.graph.add((class_uri, RDF.type, OWL.Class))
-            self.graph.add((class_uri, RDFS.comment, Literal(comment)))
+            class_uri = self._class_uri[class_name] = self._uri(class_name)
+            quads.append((class_uri, RDF.type, OWL.Class, self.graph))
+            quads.append((class_uri, RDFS.comment, Literal(comment), self.graph))
+        self.graph.addN(quads)
             
     def _define_properties(self):
         """Define object and data properties"""
@@ -91,12 +153,13 @@ class UniversityOntology:
             ("presentedAt", "Publication", "Conference", "Publication presented at conference")
         ]
         
+        quads = []
         for prop, domain, range_, comment in obj_properties:
-            prop_uri = self.univ_ns[prop]
-            self.graph.add((prop_uri, RDF.type, OWL.ObjectProperty))
-            self.graph.add((prop_uri, RDFS.domain, self.univ_ns[domain]))
-            self.graph.add((prop_uri, RDFS.range, self.univ_ns[range_]))
-            self.graph.add((prop_uri, RDFS.comment, Literal(comment)))
+            prop_uri = self._prop_uri[prop] = self._uri(prop)
+            quads.append((prop_uri, RDF.type, OWL.ObjectProperty, self.graph))
+            quads.append((prop_uri, RDFS.domain, self.univ_ns[domain], self.graph))
+            quads.append((prop_uri, RDFS.range, self.univ_ns[range_], self.graph))
+            quads.append((prop_uri, RDFS.comment, Literal(comment), self.graph))
             
         # Data properties
         data_props = [
@@ -126,31 +189,25 @@ class UniversityOntology:
         ]
         
         for prop, dtype, comment in data_props:
-            prop_uri = self.univ_ns[prop]
-            self.graph.add((prop_uri, RDF.type, OWL.DatatypeProperty))
-            self.graph.add((prop_uri, RDFS.range, dtype))
-            self.graph.add((prop_uri, RDFS.comment, Literal(comment)))
+            prop_uri = self._prop_uri[prop] = self._uri(prop)
+            quads.append((prop_uri, RDF.type, OWL.DatatypeProperty, self.graph))
+            quads.append((prop_uri, RDFS.range, dtype, self.graph))
+            quads.append((prop_uri, RDFS.comment, Literal(comment), self.graph))
+        self.graph.addN(quads)
             
     def add_instance(self, class_name, instance_id, properties=None):
         """Add an instance to the ontology"""
         try:
-            instance_uri = self.univ_ns[instance_id]
-            class_uri = self.univ_ns[class_name]
+            instance_uri = self._uri(instance_id)
             
             # Check if instance already exists
             if (instance_uri, RDF.type, OWL.NamedIndividual) in self.graph:
                 raise ValueError(f"Instance '{instance_id}' already exists")
                 
-            self.graph.add((instance_uri, RDF.type, class_uri))
-            self.graph.add((instance_uri, RDF.type, OWL.NamedIndividual))
-            
-            if properties:
-                for prop, value in properties.items():
-                    prop_uri = self.univ_ns[prop]
-                    if isinstance(value, str) and value.startswith("http"):
-                        self.graph.add((instance_uri, prop_uri, URIRef(value)))
-                    else:
-                        self.graph.add((instance_uri, prop_uri, Literal(value)))
+            quads, relationships = self._instance_quads(instance_uri, class_name, properties)
+                        
+            self.graph.addN(quads)
+            self._adjust_counts(instances=1, relationships=relationships)
                         
             logger.info(f"Added instance '{instance_id}' of class '{class_name}'")
             return True
@@ -159,12 +216,111 @@ class UniversityOntology:
             logger.error(f"Failed to add instance: {e}")
             raise
             
+    def _instance_quads(self, instance_uri, class_name, properties):
+        """Build the quads describing an instance
+        
+        Returns the quads and the number of URI-valued (relationship) properties.
+        """
+        graph = self.graph
+        class_uri = self._class_uri.get(class_name) or self._uri(class_name)
+        quads = [
+            (instance_uri, RDF.type, class_uri, graph),
+            (instance_uri, RDF.type, OWL.NamedIndividual, graph)
+        ]
+        
+        uri_props = []
+        if properties:
+            # Split URI-valued from literal-valued properties up front
+            prop_uri = self._prop_uri
+            lit_props = []
+            for prop, value in properties.items():
+                if isinstance(value, str) and value[:4] == "http":
+                    uri_props.append((prop_uri.get(prop) or self._uri(prop), value))
+                else:
+                    lit_props.append((prop_uri.get(prop) or self._uri(prop), value))
+                    
+            quads.extend((instance_uri, p, URIRef(v), graph) for p, v in uri_props)
+            quads.extend((instance_uri, p, Literal(v), graph) for p, v in lit_props)
+            
+        return quads, len(uri_props)
+        
+    def add_instances_bulk(self, instances):
+        """Add many (class_name, instance_id, properties) instances in one batch"""
+        try:
+            existing = set(self.graph.subjects(RDF.type, OWL.NamedIndividual))
+            seen = set()
+            quads = []
+            for class_name, instance_id, properties in instances:
+                instance_uri = self._uri(instance_id)
+                if instance_uri in existing or instance_uri in seen:
+                    raise ValueError(f"Instance '{instance_id}' already exists")
+                seen.add(instance_uri)
+                quads.extend(self._instance_quads(instance_uri, class_name, properties)[0])
+                
+            self.graph.addN(quads)
+            self.version += 1
+            if not self._batch_depth:
+                self._reset_counts()
+            logger.info(f"Added {len(seen)} instances")
+            return len(seen)
+            
+        except Exception as e:
+            logger.error(f"Failed to add instances: {e}")
+            raise
+            
+    def add_relationships_bulk(self, relationships):
+        """Add many (subject_id, predicate, object_id) relationships in one batch"""
+        try:
+            graph = self.graph
+            prop_uri = self._prop_uri
+            quads = [
+                (self._uri(subject_id), prop_uri.get(predicate) or self._uri(predicate),
+                 self._uri(object_id), graph)
+                for subject_id, predicate, object_id in relationships
+            ]
+            
+            # Existing triples are collapsed by the store
+            graph.addN(quads)
+            self.version += 1
+            if not self._batch_depth:
+                self._reset_counts()
+            logger.info(f"Added {len(quads)} relationships")
+            return len(quads)
+            
+        except Exception as e:
+            logger.error(f"Failed to add relationships: {e}")
+            raise
+            
+    def bulk_load(self, instances, relationships):
+        """Add instances and then relationships, each as a single batch"""
+        self.add_instances_bulk(instances)
+        self.add_relationships_bulk(relationships)
+        
+    def begin_batch(self):
+        """Start a batch of bulk writes; bookkeeping is deferred to end_batch"""
+        self._batch_depth += 1
+        
+    def end_batch(self):
+        """Finish a batch of bulk writes and rebuild the statistics once"""
+        self._batch_depth -= 1
+        if not self._batch_depth:
+            self._reset_counts()
+            
+    @contextmanager
+    def batch_mode(self):
+        """Context manager wrapping begin_batch/end_batch"""
+        self.begin_batch()
+        try:
+            yield self
+        finally:
+            self.end_batch()
+        
     def add_relationship(self, subject_id, predicate, object_id):
         """Add relationship between instances"""
         try:
-            subj_uri = self.univ_ns[subject_id]
-            obj_uri = self.univ_ns[object_id]
-            pred_uri = self.univ_ns[predicate]
+            subj_uri = self._uri(subject_id)
+            obj_uri = self._uri(object_id)
+            pred_uri = self._prop_uri.get(predicate) or self._uri(predicate)
             
             # Check if relationship already exists
             if (subj_uri, pred_uri, obj_uri) in self.graph:
@@ -172,6 +328,7 @@ class UniversityOntology:
                 return False
                 
             self.graph.add((subj_uri, pred_uri, obj_uri))
+            self._adjust_counts(relationships=1)
             logger.info(f"Added relationship: {subject_id} {predicate} {object_id}")
             return True
             
@@ -179,122 +336,156 @@ class UniversityOntology:
             logger.error(f"Failed to add relationship: {e}")
             raise
             
+    def remove_relationship(self, subject_id, predicate, object_id):
+        """Remove a relationship between instances"""
+        try:
+            triple = (self._uri(subject_id), self._prop_uri.get(predicate) or self._uri(predicate),
+                      self._uri(object_id))
+            if triple not in self.graph:
+                return False
+                
+            self.graph.remove(triple)
+            self._adjust_counts(relationships=-int(self._is_relationship(triple[1], triple[2])))
+            logger.info(f"Removed relationship: {subject_id} {predicate} {object_id}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Failed to remove relationship: {e}")
+            raise
+            
     def remove_instance(self, instance_id):
         """Remove an instance and all its relationships"""
         try:
-            instance_uri = self.univ_ns[instance_id]
+            instance_uri = self._uri(instance_id)
             
-            # Remove all triples where instance is subject or object
-            triples_to_remove = list(self.graph.triples((instance_uri, None, None))) + \
-                               list(self.graph.triples((None, None, instance_uri)))
+            # Work out what the removal takes away from the statistics
+            was_instance = (instance_uri, RDF.type, OWL.NamedIndividual) in self.graph
+            triples = list(self.graph.triples((instance_uri, None, None)))
+            triples.extend(t for t in self.graph.triples((None, None, instance_uri))
+                           if t[0] != instance_uri)
+            relationships = sum(1 for s, p, o in triples if self._is_relationship(p, o))
             
-            for triple in triples_to_remove:
-                self.graph.remove(triple)
+            # Remove all triples where instance is subject or object
+            self.graph.remove((instance_uri, None, None))
+            self.graph.remove((None, None, instance_uri))
+            self._adjust_counts(instances=-int(was_instance),
+                                relationships=-relationships)
                 
             logger.info(f"Removed instance '{instance_id}'")
-            return len(triples_to_remove)
+            return len(triples)
             
         except Exception as e:
             logger.error(f"Failed to remove instance: {e}")
             raise
             
-    def query(self, sparql_query, limit=None):
-        """Execute SPARQL query"""
+    def query(self, sparql_query, limit=None, initBindings=None):
+        """Execute a SPARQL query string or a prepared query"""
         try:
             if limit:
                 sparql_query = f"{sparql_query.rstrip(';')} LIMIT {limit}"
-            return self.graph.query(sparql_query)
+            return self.graph.query(sparql_query, initBindings=initBindings)
         except Exception as e:
             logger.error(f"SPARQL query failed: {e}")
             raise
             
+    def cached_query(self, sparql_query, initBindings=None):
+        """Execute a SPARQL query, reusing the rows until the ontology changes"""
+        bindings = tuple(sorted(initBindings.items())) if initBindings else ()
+        return self._cached_query(sparql_query, self.version, bindings)
+        
+    def _materialized_query(self, sparql_query, version, bindings=()):
+        """Run a query and return its rows as a list"""
+        return list(self.query(sparql_query, initBindings=dict(bindings) or None))
+        
     def get_statistics(self):
         """Get ontology statistics"""
+        # Counters are kept up to date by the mutation methods; after bulk
+        # writes they are rebuilt once here
+        if self._counts_version != self.version:
+            self._reset_counts()
+        return dict(self._counts)
+        
+    def _count_statistics(self):
+        """Count classes, instances, properties and relationships in the graph"""
         stats = {}
         
-        # Count classes
-        classes_query = "SELECT (COUNT(DISTINCT ?class) as ?count) WHERE { ?class rdf:type owl:Class }"
-        stats['classes'] = int(list(self.query(classes_query))[0]['count'])
-        
-        # Count instances
-        instances_query = "SELECT (COUNT(DISTINCT ?instance) as ?count) WHERE { ?instance rdf:type owl:NamedIndividual }"
-        stats['instances'] = int(list(self.query(instances_query))[0]['count'])
-        
-        # Count object properties
-        obj_props_query = "SELECT (COUNT(DISTINCT ?prop) as ?count) WHERE { ?prop rdf:type owl:ObjectProperty }"
-        stats['object_properties'] = int(list(self.query(obj_props_query))[0]['count'])
-        
-        # Count data properties
-        data_props_query = "SELECT (COUNT(DISTINCT ?prop) as ?count) WHERE { ?prop rdf:type owl:DatatypeProperty }"
-        stats['data_properties'] = int(list(self.query(data_props_query))[0]['count'])
-        
-        # Count relationships
-        rel_query = """
-        SELECT (COUNT(*) as ?count) WHERE {
-            ?s ?p ?o .
-            FILTER (isURI(?o))
-            FILTER (STRSTARTS(STR(?p), STR(univ:)))
-        }
-        """
-        stats['relationships'] = int(list(self.query(rel_query))[0]['count'])
+        # Type counts go straight through the store's (p, o) index
+        stats['classes'] = sum(1 for _ in self.graph.subjects(RDF.type, OWL.Class))
+        stats['instances'] = sum(1 for _ in self.graph.subjects(RDF.type, OWL.NamedIndividual))
+        stats['object_properties'] = sum(1 for _ in self.graph.subjects(RDF.type, OWL.ObjectProperty))
+        stats['data_properties'] = sum(1 for _ in self.graph.subjects(RDF.type, OWL.DatatypeProperty))
+        
+        # Count relationships (univ: predicates pointing at resources) in one pass
+        stats['relationships'] = sum(1 for s, p, o in self.graph if self._is_relationship(p, o))
         
         return stats
         
+    def _is_relationship(self, predicate, obj):
+        """Check whether a triple links two resources through a univ: property"""
+        return isinstance(obj, URIRef) and str(predicate).startswith(self.namespace)
+        
+    def _reset_counts(self):
+        """Rebuild the statistics counters from the graph"""
+        self._counts = self._count_statistics()
+        self._counts_version = self.version
+        
+    def _adjust_counts(self, **deltas):
+        """Bump the version and apply counter deltas for a single mutation"""
+        fresh = self._counts_version == self.version
+        self.version += 1
+        if not fresh:
+            # Counters were already stale; get_statistics will recount
+            return
+        for key, delta in deltas.items():
+            self._counts[key] += delta
+        self._counts_version = self.version
+        
     def get_class_hierarchy(self):
-        """Get class hierarchy as nested dictionary"""
+        """Get class hierarchy as nested dictionary, cached until the ontology changes
+        
+        The returned dictionary is shared between callers and must not be modified.
+        """
+        if self._hierarchy_cache is None or self._hierarchy_cache[0] != self.version:
+            self._hierarchy_cache = (self.version, self._build_class_hierarchy())
+        return self._hierarchy_cache[1]
+        
+    def _build_class_hierarchy(self):
+        """Build the class hierarchy from the graph"""
         hierarchy = {}
         
         # Get all classes
-        classes_query = """
-        SELECT ?class ?label ?comment
-        WHERE {
-            ?class rdf:type owl:Class .
-            OPTIONAL { ?class rdfs:label ?label }
-            OPTIONAL { ?class rdfs:comment ?comment }
-        }
-        """
+        classes = list(self.graph.subjects(RDF.type, OWL.Class))
+        class_set = set(classes)
+        
+        # Collect labels, comments and subclass links with one indexed scan each
+        labels = {s: o for s, _, o in self.graph.triples((None, RDFS.label, None)) if s in class_set}
+        comments = {s: o for s, _, o in self.graph.triples((None, RDFS.comment, None)) if s in class_set}
         
-        for row in self.query(classes_query):
-            class_uri = str(row['class'])
-            class_name = class_uri.split('#')[-1]
-            label = str(row['label']) if row['label'] else class_name
-            comment = str(row['comment']) if row['comment'] else ""
+        subclass_map = defaultdict(list)
+        for sub, _, sup in self.graph.triples((None, RDFS.subClassOf, None)):
+            subclass_map[sup].append(str(sub).split('#')[-1])
             
-            # Get subclass relationships
-            sub_query = f"""
-            SELECT ?subclass WHERE {{
-                ?subclass rdfs:subClassOf <{class_uri}> .
-            }}
-            """
+        # Count named individuals per class
+        named = set(self.graph.subjects(RDF.type, OWL.NamedIndividual))
+        instance_counts = Counter(
+            o for s, _, o in self.graph.triples((None, RDF.type, None))
+            if o in class_set and s in named
+        )
+        
+        for class_uri in classes:
+            class_name = str(class_uri).split('#')[-1]
+            label = labels.get(class_uri)
+            comment = comments.get(class_uri)
             
-            subclasses = []
-            for sub_row in self.query(sub_query):
-                sub_uri = str(sub_row['subclass'])
-                sub_name = sub_uri.split('#')[-1]
-                subclasses.append(sub_name)
-                
             hierarchy[class_name] = {
-                'label': label,
-                'comment': comment,
-                'subclasses': subclasses,
-                'instance_count': self._count_instances(class_uri)
+                'label': str(label) if label else class_name,
+                'comment': str(comment) if comment else "",
+                'subclasses': subclass_map.get(class_uri, []),
+                'instance_count': instance_counts[class_uri]
             }
             
         return hierarchy
         
-    def _count_instances(self, class_uri):
-        """Count instances of a class"""
-        query = f"""
-        SELECT (COUNT(?instance) as ?count)
-        WHERE {{
-            ?instance rdf:type <{class_uri}> .
-            ?instance rdf:type owl:NamedIndividual .
-        }}
-        """
-        
-        result = list(self.query(query))
-        return int(result[0]['count']) if result else 0
-        
     def save_ontology(self, filename, format='turtle'):
         """Save ontology to file"""
         self.graph.serialize(destination=filename, format=format)
@@ -302,9 +493,44 @@ class UniversityOntology:
         
     def load_ontology(self, filename, format=None):
         """Load ontology from file"""
-        self.graph.parse(filename, format=format)
+        if format is None:
+            ext = os.path.splitext(filename)[1].lower()
+            format = FORMAT_BY_EXTENSION.get(ext)
+            
+        if self.graph.store.__class__.__name__ == 'OxigraphStore' and format in OXIGRAPH_FORMATS:
+            # Parse directly into the store with the native parser
+            self.graph.parse(filename, format=OXIGRAPH_FORMATS[format])
+        elif format == 'turtle' and self._load_with_rapper(filename):
+            pass
+        else:
+            self.graph.parse(filename, format=format)
+        self.version += 1
+        self._reset_counts()
         logger.info(f"Ontology loaded from {filename}")
         
+    def _load_with_rapper(self, filename):
+        """Load a large Turtle file by converting it to N-Triples with rapper
+        
+        Returns False when rapper is not installed, the file is small, or the
+        conversion fails, so the caller can fall back to rdflib's parser.
+        """
+        rapper = shutil.which('rapper')
+        if not rapper or os.path.getsize(filename) < RAPPER_MIN_SIZE:
+            return False
+            
+        fd, nt_file = tempfile.mkstemp(suffix='.nt')
+        try:
+            with os.fdopen(fd, 'wb') as out:
+                subprocess.run([rapper, '-q', '-i', 'turtle', '-o', 'ntriples', filename],
+                               stdout=out, check=True)
+            self.graph.parse(nt_file, format='nt')
+            return True
+        except (OSError, subprocess.CalledProcessError) as e:
+            logger.warning(f"rapper conversion failed, using rdflib parser: {e}")
+            return False
+        finally:
+            os.remove(nt_file)
+        
     def clear(self):
         """Clear all data from ontology"""
         self.graph.remove((None, None, None))
@@ -4,18 +4,43 @@ Advanced SPARQL query engine with caching and optimization
 
 import re
 import time
+from collections import OrderedDict, deque
 from functools import lru_cache
 import logging
 
 logger = logging.getLogger(__name__)
 
+# String literals and IRIs are matched first and kept verbatim; outside them
+# runs of whitespace and '#' comments collapse to a single space
+_KEY_TOKEN_RE = re.compile(
+    r'("""[\s\S]*?"""' r"|'''[\s\S]*?'''"
+    r'|"(?:[^"\\\n]|\\.)*"' r"|'(?:[^'\\\n]|\\.)*'"
+    r'|<[^<>"{}|^`\\\s]*>)'
+    r'|(?:\s|#[^\n]*)+'
+)
+
+def _normalize_token(match):
+    """Keep literals and IRIs, collapse whitespace and comments"""
+    return match.group(1) or ' '
+
+class QueryResult(list):
+    """Materialized SPARQL result rows that keep the result metadata"""
+    
+    def __init__(self, result):
+        super().__init__(result)
+        self.type = result.type
+        self.vars = result.vars
+        self.askAnswer = result.askAnswer
+
 class QueryEngine:
     """Enhanced SPARQL query engine"""
     
+    MAX_CACHE_SIZE = 128
+    
     def __init__(self, ontology):
         self.ontology = ontology
-        self.query_cache = {}
-        self.query_history = []  # Store query history
+        self.query_cache = OrderedDict()  # LRU of materialized results by (query, version)
+        self.query_history = deque(maxlen=100)  # Store the last 100 queries
         
     def execute_query(self, sparql_query, limit=100, timeout=30):
         """Execute SPARQL query with timeout and limit"""
@@ -26,35 +51,37 @@ class QueryEngine:
             if 'LIMIT' not in sparql_query.upper():
                 sparql_query = f"{sparql_query.rstrip(';')} LIMIT {limit}"
                 
-            # Check cache
-            cache_key = self._get_cache_key(sparql_query)
+            # Check cache; the ontology version makes results from before a
+            # mutation unreachable
+            cache_key = (self._get_cache_key(sparql_query), self.ontology.version)
             if cache_key in self.query_cache:
                 logger.info("Query result retrieved from cache")
+                self.query_cache.move_to_end(cache_key)
                 return self.query_cache[cache_key]
                 
-            # Execute query
+            # Execute query and materialize the rows once so cache hits
+            # never hand out an exhausted iterator
             result = self.ontology.query(sparql_query)
+            result_list = QueryResult(result)
             
             # Cache result
-            self.query_cache[cache_key] = result
+            self.query_cache[cache_key] = result_list
+            if len(self.query_cache) > self.MAX_CACHE_SIZE:
+                self.query_cache.popitem(last=False)
             
-            # Add to history
-            result_list = list(result)
+            # Add to history, reusing the materialized rows for the count
+            now = time.time()
+            elapsed = now - start_time
             self.query_history.append({
                 'query': sparql_query,
-                'timestamp': time.time(),
+                'timestamp': now,
                 'result_count': len(result_list),
-                'execution_time': time.time() - start_time
+                'execution_time': elapsed
             })
             
-            # Keep only last 100 queries
-            if len(self.query_history) > 100:
-                self.query_history = self.query_history[-100:]
-            
-            elapsed = time.time() - start_time
             logger.info(f"Query executed in {elapsed:.2f} seconds")
             
-            return result
+            return result_list
             
         except Exception as e:
             logger.error(f"Query execution failed: {e}")
@@ -62,10 +89,10 @@ class QueryEngine:
             
     def _get_cache_key(self, sparql_query):
         """Generate cache key for query"""
-        # Normalize query by removing whitespace and comments
-        normalized = re.sub(r'\s+', ' ', sparql_query.strip())
-        normalized = re.sub(r'#.*$', '', normalized, flags=re.MULTILINE)
-        return hash(normalized)
+        # Normalize query by dropping comments and collapsing whitespace outside
+        # literals and IRIs. The normalized text itself is the key, so distinct
+        # queries can't collide.
+        return _KEY_TOKEN_RE.sub(_normalize_token, sparql_query).strip()
         
     def clear_cache(self):
         """Clear query cache"""
@@ -135,9 +162,9 @@ class QueryEngine:
             'student_enrollments': """
                 SELECT ?student ?studentName ?course ?courseName ?prof ?profName
                 WHERE {
+                    ?student univ:takesCourse ?course .
                     ?student rdf:type univ:Student .
                     ?student univ:name ?studentName .
-                    ?student univ:takesCourse ?course .
                     ?course univ:name ?courseName .
                     OPTIONAL {
                         ?prof univ:teaches ?course .
@@ -151,7 +178,8 @@ class QueryEngine:
     
     def get_query_history(self, limit=50):
         """Get query history"""
-        return self.query_history[-limit:] if limit else self.query_history
+        history = list(self.query_history)
+        return history[-limit:] if limit else history
     
     def clear_history(self):
         """Clear query history"""
@@ -4,9 +4,13 @@ Import and export functionality
 
 import json
 import csv
+import io
 import os
 from tkinter import filedialog, messagebox
 from datetime import datetime
+from rdflib import URIRef, Literal, RDF, OWL
+
+WRITE_BUFFER_SIZE = 1 << 20
 
 def export_ontology(ontology, format='turtle'):
     """Export ontology in specified format"""
@@ -18,7 +22,7 @@ def export_ontology(ontology, format='turtle'):
     
     if filename:
         try:
-            ontology.save_ontology(filename, format)
+            export_ontology_to(ontology, filename, format)
             messagebox.showinfo("Success", f"Ontology exported to {filename}")
             return True
         except Exception as e:
@@ -26,6 +30,10 @@ def export_ontology(ontology, format='turtle'):
             return False
     return False
 
+def export_ontology_to(ontology, filename, format='turtle'):
+    """Write the ontology to filename in the given format (no UI)"""
+    ontology.save_ontology(filename, format)
+
 def get_extension(format):
     """Get file extension for format"""
     extensions = {
@@ -50,6 +58,18 @@ def get_filetypes(format):
     }
     return filetypes.get(format, [("All files", "*.*")])
 
+def _local_name(uri, ns, ns_len):
+    """Strip the ontology namespace (or any other '#' prefix) from a URI"""
+    uri = str(uri)
+    if uri.startswith(ns):
+        return uri[ns_len:]
+    return uri.split('#')[-1]
+
+def _open_buffered(filename):
+    """Open a text file for writing with a 1 MB buffer to cut write syscalls"""
+    return io.TextIOWrapper(open(filename, 'wb', buffering=WRITE_BUFFER_SIZE),
+                            encoding='utf-8', newline='')
+
 def export_instances_csv(ontology, class_filter=None):
     """Export instances to CSV"""
     filename = filedialog.asksaveasfilename(
@@ -62,57 +82,7 @@ def export_instances_csv(ontology, class_filter=None):
         return False
         
     try:
-        # Build query based on filter
-        if class_filter and class_filter != "All":
-            class_uri = ontology.univ_ns[class_filter]
-            query = f"""
-            SELECT ?instance ?name ?id ?description
-            WHERE {{
-                ?instance rdf:type owl:NamedIndividual .
-                ?instance rdf:type <{class_uri}> .
-                OPTIONAL {{ ?instance univ:name ?name }}
-                OPTIONAL {{ ?instance univ:id ?id }}
-                OPTIONAL {{ ?instance univ:description ?description }}
-            }}
-            """
-        else:
-            query = """
-            SELECT ?instance ?class ?name ?id ?description
-            WHERE {
-                ?instance rdf:type owl:NamedIndividual .
-                ?instance rdf:type ?class .
-                FILTER (?class != owl:NamedIndividual)
-                OPTIONAL { ?instance univ:name ?name }
-                OPTIONAL { ?instance univ:id ?id }
-                OPTIONAL { ?instance univ:description ?description }
-            }
-            """
-            
-        results = ontology.query(query)
-        
-        with open(filename, 'w', newline='', encoding='utf-8') as f:
-            if class_filter and class_filter != "All":
-                writer = csv.writer(f)
-                writer.writerow(['Instance', 'Name', 'ID', 'Description'])
-                
-                for row in results:
-                    instance = str(row['instance']).split('#')[-1]
-                    name = str(row['name']) if row.get('name') else ""
-                    id_ = str(row['id']) if row.get('id') else ""
-                    description = str(row['description']) if row.get('description') else ""
-                    writer.writerow([instance, name, id_, description])
-            else:
-                writer = csv.writer(f)
-                writer.writerow(['Instance', 'Class', 'Name', 'ID', 'Description'])
-                
-                for row in results:
-                    instance = str(row['instance']).split('#')[-1]
-                    class_ = str(row['class']).split('#')[-1]
-                    name = str(row['name']) if row.get('name') else ""
-                    id_ = str(row['id']) if row.get('id') else ""
-                    description = str(row['description']) if row.get('description') else ""
-                    writer.writerow([instance, class_, name, id_, description])
-                    
+        export_instances_csv_to(ontology, filename, class_filter)
         messagebox.showinfo("Success", f"Instances exported to {filename}")
         return True
         
@@ -120,6 +90,46 @@ def export_instances_csv(ontology, class_filter=None):
         messagebox.showerror("Error", f"Failed to export: {str(e)}")
         return False
         
+def export_instances_csv_to(ontology, filename, class_filter=None):
+    """Write instances to a CSV file (no UI)"""
+    # Read straight from the triple indexes instead of a SPARQL join
+    graph = ontology.graph
+    ns = ontology.namespace
+    ns_len = len(ns)
+    name_p = ontology.univ_ns.name
+    id_p = ontology.univ_ns.id
+    desc_p = ontology.univ_ns.description
+    value = graph.value
+    
+    # Single-valued columns are direct (s, p) index lookups
+    def literal_values(instance):
+        name = value(instance, name_p)
+        id_ = value(instance, id_p)
+        description = value(instance, desc_p)
+        return [str(name) if name else "",
+                str(id_) if id_ else "",
+                str(description) if description else ""]
+    
+    with _open_buffered(filename) as f:
+        writer = csv.writer(f)
+        
+        if class_filter and class_filter != "All":
+            class_uri = ontology.univ_ns[class_filter]
+            writer.writerow(['Instance', 'Name', 'ID', 'Description'])
+            
+            for instance in graph.subjects(RDF.type, class_uri):
+                if (instance, RDF.type, OWL.NamedIndividual) in graph:
+                    writer.writerow([_local_name(instance, ns, ns_len)] + literal_values(instance))
+        else:
+            writer.writerow(['Instance', 'Class', 'Name', 'ID', 'Description'])
+            
+            for instance in graph.subjects(RDF.type, OWL.NamedIndividual):
+                values = literal_values(instance)
+                for class_uri in graph.objects(instance, RDF.type):
+                    if class_uri != OWL.NamedIndividual:
+                        writer.writerow([_local_name(instance, ns, ns_len),
+                                         _local_name(class_uri, ns, ns_len)] + values)
+        
 def export_relationships_csv(ontology):
     """Export relationships to CSV"""
     filename = filedialog.asksaveasfilename(
@@ -132,28 +142,7 @@ def export_relationships_csv(ontology):
         return False
         
     try:
-        query = """
-        SELECT ?subject ?predicate ?object
-        WHERE {
-            ?subject ?predicate ?object .
-            FILTER (isURI(?object))
-            FILTER (STRSTARTS(STR(?predicate), STR(univ:)))
-        }
-        ORDER BY ?predicate ?subject
-        """
-        
-        results = ontology.query(query)
-        
-        with open(filename, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(['Subject', 'Predicate', 'Object'])
-            
-            for row in results:
-                subject = str(row['subject']).split('#')[-1]
-                predicate = str(row['predicate']).split('#')[-1]
-                object_ = str(row['object']).split('#')[-1]
-                writer.writerow([subject, predicate, object_])
-                
+        export_relationships_csv_to(ontology, filename)
         messagebox.showinfo("Success", f"Relationships exported to {filename}")
         return True
         
@@ -161,32 +150,45 @@ def export_relationships_csv(ontology):
         messagebox.showerror("Error", f"Failed to export: {str(e)}")
         return False
         
+def export_relationships_csv_to(ontology, filename):
+    """Write relationships to a CSV file (no UI)"""
+    ns = ontology.namespace
+    ns_len = len(ns)
+    
+    # Scan the graph once; only the plain term tuples are sorted
+    triples = sorted(
+        (p, s, o) for s, p, o in ontology.graph
+        if isinstance(o, URIRef) and str(p).startswith(ns)
+    )
+    
+    with _open_buffered(filename) as f:
+        writer = csv.writer(f)
+        writer.writerow(['Subject', 'Predicate', 'Object'])
+        
+        for predicate, subject, object_ in triples:
+            writer.writerow([_local_name(subject, ns, ns_len),
+                             str(predicate)[ns_len:],
+                             _local_name(object_, ns, ns_len)])
+        
+_CSV_PROPERTY_COLUMNS = (('Name', 'name'), ('ID', 'id'), ('Description', 'description'))
+
 def import_csv_instances(ontology, filename):
     """Import instances from CSV"""
     try:
+        instances = []
+        
         with open(filename, 'r', encoding='utf-8') as f:
             reader = csv.DictReader(f)
             
-            imported = 0
             for row in reader:
                 if 'Class' in row and 'Instance' in row:
-                    class_name = row['Class']
-                    instance_id = row['Instance']
-                    
                     # Collect properties
-                    properties = {}
-                    if 'Name' in row and row['Name']:
-                        properties['name'] = row['Name']
-                    if 'ID' in row and row['ID']:
-                        properties['id'] = row['ID']
-                    if 'Description' in row and row['Description']:
-                        properties['description'] = row['Description']
-                        
-                    # Add instance
-                    ontology.add_instance(class_name, instance_id, properties)
-                    imported += 1
+                    properties = {prop: row[column] for column, prop in _CSV_PROPERTY_COLUMNS
+                                  if row.get(column)}
+                    instances.append((row['Class'], row['Instance'], properties))
                     
-        return imported
+        # Add everything in a single batch; the ontology rejects duplicates
+        return ontology.add_instances_bulk(instances)
         
     except Exception as e:
         raise Exception(f"Failed to import CSV: {str(e)}")
@@ -196,38 +198,57 @@ def import_csv_relationships(ontology, filename):
     try:
         with open(filename, 'r', encoding='utf-8') as f:
             reader = csv.DictReader(f)
-            
-            imported = 0
-            for row in reader:
-                if all(k in row for k in ['Subject', 'Predicate', 'Object']):
-                    subject = row['Subject']
-                    predicate = row['Predicate']
-                    object_ = row['Object']
+            relationships = [
+                (row['Subject'], row['Predicate'], row['Object'])
+                for row in reader
+                if all(k in row for k in ['Subject', 'Predicate', 'Object'])
+            ]
                     
-                    # Add relationship
-                    ontology.add_relationship(subject, predicate, object_)
-                    imported += 1
-                    
-        return imported
+        # Duplicate triples are collapsed by the store
+        return ontology.add_relationships_bulk(relationships)
         
     except Exception as e:
         raise Exception(f"Failed to import CSV: {str(e)}")
         
-def create_backup(ontology, backup_dir='backups'):
-    """Create backup of ontology"""
-    import os
-    from datetime import datetime
+_NT_ESCAPES = str.maketrans({'\\': '\\\\', '"': '\\"', '\n': '\\n', '\r': '\\r'})
+
+def _nt_term(term):
+    """Encode a single RDF term as N-Triples"""
+    if isinstance(term, Literal):
+        encoded = f'"{str(term).translate(_NT_ESCAPES)}"'
+        if term.language:
+            return f"{encoded}@{term.language}"
+        if term.datatype:
+            return f"{encoded}^^<{term.datatype}>"
+        return encoded
+    return term.n3()
+
+def write_ntriples(ontology, filename):
+    """Stream the ontology graph to an N-Triples file, one line per triple"""
+    with _open_buffered(filename) as f:
+        for s, p, o in ontology.graph:
+            f.write(f"{_nt_term(s)} {_nt_term(p)} {_nt_term(o)} .\n")
+
+def create_backup(ontology, backup_dir='backups', format='nt'):
+    """Create backup of ontology
     
+    Backups default to N-Triples, which is written in a single streaming pass
+    without the prefix compaction Turtle needs; pass format='turtle' for a
+    human-readable backup.
+    """
     # Create backup directory if it doesn't exist
     if not os.path.exists(backup_dir):
         os.makedirs(backup_dir)
         
     # Generate backup filename with timestamp
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    filename = os.path.join(backup_dir, f'ontology_backup_{timestamp}.ttl')
+    filename = os.path.join(backup_dir, f'ontology_backup_{timestamp}{get_extension(format)}')
     
     try:
-        ontology.save_ontology(filename)
+        if format == 'nt':
+            write_ntriples(ontology, filename)
+        else:
+            ontology.save_ontology(filename, format)
         return filename
     except Exception as e:
         raise Exception(f"Failed to create backup: {str(e)}")
@@ -2,26 +2,153 @@
 Sample data generation for university ontology
 """
 
-import random
+import hashlib
+import inspect
+import logging
+import os
+import sys
 from datetime import datetime, timedelta
 
+import numpy as np
+from rdflib import Graph, RDF, OWL
+
+from config.settings import CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+# Fixed default seed so every run generates the same sample data
+DEFAULT_SEED = 42
+
+_FIRST_NAMES = ("Alice", "Bob", "Charlie", "Diana", "Edward",
+                "Fiona", "George", "Helen", "Ian", "Julia")
+_SURNAMES = ("Johnson", "Williams", "Brown", "Jones",
+             "Garcia", "Miller", "Davis", "Rodriguez")
+_STUDENT_PROGRAMS = ("CS_BSC", "MATH_BSC", "EE_BSC", "ENG_BA")
+_CORE_COURSES = ("CS101", "MATH101", "ENG101", "BUS101")
+_ADVISORS = ("ProfSmith", "ProfJohnson", "ProfBrown")
+
+# Description affixes shared by every generated row of a kind
+_AT_UNIVERSITY = " at University of Example"
+_DEPARTMENT_SUFFIX = " department"
+_COURSE_PREFIX = "Course: "
+_PROGRAM_PREFIX = "Degree program in "
+_RESEARCH_PREFIX = "Research project on "
+_EVENT_SUFFIX = " event"
+
 class SampleDataLoader:
     """Load sample data into ontology"""
     
-    def __init__(self, ontology):
+    def __init__(self, ontology, batch_size=500, seed=DEFAULT_SEED, cache_dir=CACHE_DIR):
         self.ontology = ontology
+        self.seed = seed
+        # Seeded runs are snapshotted to N-Triples here; None disables it
+        self.cache_dir = cache_dir
+        # Random fields are drawn in whole arrays from one seeded generator;
+        # pass seed=None for fresh data on every run
+        self._np_rng = np.random.default_rng(seed)
+        # Writes are queued here and flushed to the ontology in batches of
+        # batch_size, which keeps memory bounded for larger data sets
+        self.batch_size = batch_size
+        self._pending_instances = []
+        self._pending_rels = []
         
     def load_all(self):
-        """Load all sample data"""
-        self.load_university_structure()
-        self.load_people()
-        self.load_courses()
-        self.load_relationships()
+        """Load all sample data, from the snapshot cache when it is current"""
+        snapshot = self._snapshot_path()
+        if snapshot and self._load_snapshot(snapshot):
+            return
+            
+        graph = self.ontology.graph
+        before = set(graph) if snapshot else None
+        
+        with self.ontology.batch_mode():
+            self.load_university_structure()
+            self.load_people()
+            self.load_courses()
+            self.load_relationships()
+            self._flush()
+            
+        if snapshot:
+            self._write_snapshot(snapshot, (t for t in graph if t not in before))
+            
+    def _snapshot_version(self):
+        """Hash of everything that determines the generated triples"""
+        digest = hashlib.sha256()
+        for part in (inspect.getsource(sys.modules[__name__]),
+                     inspect.getsource(type(self.ontology)),
+                     str(self.ontology.namespace), str(self.seed)):
+            digest.update(part.encode('utf-8'))
+        return digest.hexdigest()
+        
+    def _snapshot_path(self):
+        """Snapshot file for this loader, or None if caching is off"""
+        if self.cache_dir is None or self.seed is None:
+            return None
+        return os.path.join(self.cache_dir, 'sample_data.nt')
+        
+    def _load_snapshot(self, path):
+        """Parse the snapshot if it matches the current version"""
+        try:
+            with open(path, encoding='utf-8') as f:
+                header = f.readline().strip()
+        except OSError:
+            return False
+        if header != f"# version {self._snapshot_version()}":
+            return False
+            
+        # Same guard as the generating path: sample data can be loaded once
+        university = self.ontology.univ_ns.UniversityOfExample
+        if (university, RDF.type, OWL.NamedIndividual) in self.ontology.graph:
+            raise ValueError("Instance 'UniversityOfExample' already exists")
+            
+        self.ontology.load_ontology(path, format='nt')
+        logger.info(f"Sample data loaded from snapshot {path}")
+        return True
+        
+    def _write_snapshot(self, path, triples):
+        """Write the generated triples as N-Triples behind a version header"""
+        delta = Graph()
+        for triple in triples:
+            delta.add(triple)
+            
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(f"# version {self._snapshot_version()}\n")
+                f.write(delta.serialize(format='nt'))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write sample data snapshot: {e}")
+        
+    def _add_instance(self, class_name, instance_id, properties=None):
+        """Queue an instance for the next flush"""
+        self._pending_instances.append((class_name, instance_id, properties))
+        self._maybe_flush()
+        
+    def _add_relationship(self, subject_id, predicate, object_id):
+        """Queue a relationship for the next flush"""
+        self._pending_rels.append((subject_id, predicate, object_id))
+        self._maybe_flush()
+        
+    def _maybe_flush(self):
+        """Flush once the queued writes reach the batch size"""
+        if len(self._pending_instances) + len(self._pending_rels) >= self.batch_size:
+            self._flush()
+        
+    def _flush(self):
+        """Write all queued instances and relationships to the ontology"""
+        instances, self._pending_instances = self._pending_instances, []
+        relationships, self._pending_rels = self._pending_rels, []
+        if instances:
+            self.ontology.add_instances_bulk(instances)
+        if relationships:
+            self.ontology.add_relationships_bulk(relationships)
         
     def load_university_structure(self):
         """Load university structure"""
         # University
-        self.ontology.add_instance("University", "UniversityOfExample", {
+        self._add_instance("University", "UniversityOfExample", {
             "name": "University of Example",
             "address": "123 University Avenue, Example City",
             "description": "A leading research university"
@@ -36,11 +163,11 @@ class SampleDataLoader:
         ]
         
         for fid, name in faculties:
-            self.ontology.add_instance("Faculty", fid, {
+            self._add_instance("Faculty", fid, {
                 "name": name,
-                "description": f"{name} at University of Example"
+                "description": name + _AT_UNIVERSITY
             })
-            self.ontology.add_relationship("UniversityOfExample", "hasFaculty", fid)
+            self._add_relationship("UniversityOfExample", "hasFaculty", fid)
             
         # Departments
         departments = [
@@ -55,32 +182,32 @@ class SampleDataLoader:
         ]
         
         for did, name, faculty in departments:
-            self.ontology.add_instance("Department", did, {
+            self._add_instance("Department", did, {
                 "name": name,
-                "description": f"{name} department"
+                "description": name + _DEPARTMENT_SUFFIX
             })
-            self.ontology.add_relationship(faculty, "hasDepartment", did)
+            self._add_relationship(faculty, "hasDepartment", did)
             
         # Programs
         programs = [
-            ("CS_BSC", "Bachelor of Science in Computer Science", "ComputerScience", 4),
-            ("CS_MSC", "Master of Science in Computer Science", "ComputerScience", 2),
-            ("CS_PHD", "PhD in Computer Science", "ComputerScience", 5),
-            ("MATH_BSC", "Bachelor of Science in Mathematics", "Mathematics", 4),
-            ("EE_BSC", "Bachelor of Science in Electrical Engineering", "ElectricalEngineering", 4),
-            ("ENG_BA", "Bachelor of Arts in English", "English", 4),
-            ("MBA", "Master of Business Administration", "BusinessAdmin", 2)
+            ("CS_BSC", "Bachelor of Science in Computer Science", "ComputerScience", 4, "Undergraduate"),
+            ("CS_MSC", "Master of Science in Computer Science", "ComputerScience", 2, "Graduate"),
+            ("CS_PHD", "PhD in Computer Science", "ComputerScience", 5, "Graduate"),
+            ("MATH_BSC", "Bachelor of Science in Mathematics", "Mathematics", 4, "Undergraduate"),
+            ("EE_BSC", "Bachelor of Science in Electrical Engineering", "ElectricalEngineering", 4, "Undergraduate"),
+            ("ENG_BA", "Bachelor of Arts in English", "English", 4, "Undergraduate"),
+            ("MBA", "Master of Business Administration", "BusinessAdmin", 2, "Graduate")
         ]
         
-        for pid, name, dept, duration in programs:
-            self.ontology.add_instance("Program", pid, {
+        for pid, name, dept, duration, level in programs:
+            self._add_instance("Program", pid, {
                 "name": name,
                 "code": pid,
                 "duration": f"P{duration}Y",
-                "description": f"Degree program in {name}",
-                "level": "Undergraduate" if "B" in pid else "Graduate"
+                "description": _PROGRAM_PREFIX + name,
+                "level": level
             })
-            self.ontology.add_relationship(dept, "offersProgram", pid)
+            self._add_relationship(dept, "offersProgram", pid)
             
     def load_people(self):
         """Load sample people data"""
@@ -95,38 +222,43 @@ class SampleDataLoader:
         ]
         
         for pid, name, email, title, dept, salary in professors:
-            self.ontology.add_instance("Professor", pid, {
+            self._add_instance("Professor", pid, {
                 "name": name,
                 "email": email,
                 "title": title,
                 "salary": salary,
                 "id": f"P{pid}"
             })
-            self.ontology.add_relationship(pid, "worksIn", dept)
-            self.ontology.add_relationship(pid, "memberOf", dept)
+            self._add_relationship(pid, "worksIn", dept)
+            self._add_relationship(pid, "memberOf", dept)
             
         # Students
+        num_students = 30
+        rng = self._np_rng
+        program_idx = rng.integers(0, len(_STUDENT_PROGRAMS), size=num_students).tolist()
+        gpas = np.round(rng.uniform(2.5, 4.0, size=num_students), 2).tolist()
+        first_idx = rng.integers(0, len(_FIRST_NAMES), size=num_students).tolist()
+        last_idx = rng.integers(0, len(_SURNAMES), size=num_students).tolist()
+        
         students = []
-        for i in range(1, 31):
-            program = random.choice(["CS_BSC", "MATH_BSC", "EE_BSC", "ENG_BA"])
-            gpa = round(random.uniform(2.5, 4.0), 2)
+        for i in range(num_students):
+            program = _STUDENT_PROGRAMS[program_idx[i]]
+            gpa = gpas[i]
             
-            student_id = f"Student{i:03d}"
-            name = random.choice(["Alice", "Bob", "Charlie", "Diana", "Edward", 
-                                 "Fiona", "George", "Helen", "Ian", "Julia"])
-            surname = random.choice(["Johnson", "Williams", "Brown", "Jones", 
-                                    "Garcia", "Miller", "Davis", "Rodriguez"])
+            student_id = f"Student{i + 1:03d}"
+            name = _FIRST_NAMES[first_idx[i]]
+            surname = _SURNAMES[last_idx[i]]
             full_name = f"{name} {surname}"
             email = f"{name.lower()}.{surname.lower()}@student.edu"
             
-            self.ontology.add_instance("Student", student_id, {
+            self._add_instance("Student", student_id, {
                 "name": full_name,
                 "email": email,
                 "gpa": gpa,
                 "id": student_id,
                 "startDate": "2023-09-01"
             })
-            self.ontology.add_relationship(student_id, "enrolledIn", program)
+            self._add_relationship(student_id, "enrolledIn", program)
             
             students.append(student_id)
             
@@ -138,7 +270,7 @@ class SampleDataLoader:
         ]
         
         for sid, name, email in staff:
-            self.ontology.add_instance("Staff", sid, {
+            self._add_instance("Staff", sid, {
                 "name": name,
                 "email": email,
                 "title": name
@@ -159,21 +291,23 @@ class SampleDataLoader:
             ("BUS101", "Introduction to Business", 3, "BusinessAdmin", "Spring")
         ]
         
-        for cid, name, credits, dept, semester in courses:
-            self.ontology.add_instance("Course", cid, {
+        capacities = self._np_rng.integers(20, 51, size=len(courses)).tolist()
+        
+        for (cid, name, credits, dept, semester), capacity in zip(courses, capacities):
+            self._add_instance("Course", cid, {
                 "name": name,
                 "code": cid,
                 "credits": credits,
-                "description": f"Course: {name}",
+                "description": _COURSE_PREFIX + name,
                 "semester": semester,
-                "capacity": random.randint(20, 50)
+                "capacity": capacity
             })
-            self.ontology.add_relationship("CS_BSC", "hasCourse", cid)
+            self._add_relationship("CS_BSC", "hasCourse", cid)
             
         # Add course prerequisites
-        self.ontology.add_relationship("CS201", "hasPrerequisite", "CS101")
-        self.ontology.add_relationship("CS301", "hasPrerequisite", "CS201")
-        self.ontology.add_relationship("CS401", "hasPrerequisite", "CS301")
+        self._add_relationship("CS201", "hasPrerequisite", "CS101")
+        self._add_relationship("CS301", "hasPrerequisite", "CS201")
+        self._add_relationship("CS401", "hasPrerequisite", "CS301")
         
     def load_relationships(self):
         """Load sample relationships"""
@@ -190,22 +324,27 @@ class SampleDataLoader:
         ]
         
         for prof, course in teaching:
-            self.ontology.add_relationship(prof, "teaches", course)
+            self._add_relationship(prof, "teaches", course)
             
         # Student course enrollments
         students = [f"Student{i:03d}" for i in range(1, 31)]
-        courses = ["CS101", "MATH101", "ENG101", "BUS101"]
+        courses = _CORE_COURSES
         
-        for student in students[:20]:  # First 20 students
-            enrolled_courses = random.sample(courses, random.randint(1, 3))
-            for course in enrolled_courses:
-                self.ontology.add_relationship(student, "takesCourse", course)
+        # First 20 students take 1-3 distinct courses; each row of the
+        # argsort is an independent random permutation of the courses
+        enrolled = students[:20]
+        rng = self._np_rng
+        counts = rng.integers(1, 4, size=len(enrolled)).tolist()
+        orders = rng.random((len(enrolled), len(courses))).argsort(axis=1).tolist()
+        for student, count, order in zip(enrolled, counts, orders):
+            for j in order[:count]:
+                self._add_relationship(student, "takesCourse", courses[j])
                 
         # Advisor relationships
         for i, student in enumerate(students[:10]):
-            prof = ["ProfSmith", "ProfJohnson", "ProfBrown"][i % 3]
-            self.ontology.add_relationship(student, "hasAdvisor", prof)
-            self.ontology.add_relationship(student, "supervisedBy", prof)
+            prof = _ADVISORS[i % len(_ADVISORS)]
+            self._add_relationship(student, "hasAdvisor", prof)
+            self._add_relationship(student, "supervisedBy", prof)
             
         # Research projects
         research_projects = [
@@ -215,13 +354,13 @@ class SampleDataLoader:
         ]
         
         for rid, name, prof in research_projects:
-            self.ontology.add_instance("Research", rid, {
+            self._add_instance("Research", rid, {
                 "name": name,
-                "description": f"Research project on {name}",
+                "description": _RESEARCH_PREFIX + name,
                 "startDate": "2023-01-01",
                 "status": "Active"
             })
-            self.ontology.add_relationship(prof, "partOfResearch", rid)
+            self._add_relationship(prof, "partOfResearch", rid)
             
         # Publications
         publications = [
@@ -230,14 +369,16 @@ class SampleDataLoader:
             ("Pub003", "Business Intelligence", "ProfTaylor", "Business_Analytics", 2022)
         ]
         
-        for pubid, title, author, research, year in publications:
-            self.ontology.add_instance("Publication", pubid, {
+        isbns = self._np_rng.integers(10**9, 10**10, size=len(publications)).tolist()
+        
+        for (pubid, title, author, research, year), isbn in zip(publications, isbns):
+            self._add_instance("Publication", pubid, {
                 "name": title,
                 "title": title,
                 "year": year,
-                "ISBN": f"ISBN-{random.randint(1000000000, 9999999999)}"
+                "ISBN": f"ISBN-{isbn}"
             })
-            self.ontology.add_relationship(author, "published", pubid)
+            self._add_relationship(author, "published", pubid)
             
         # Buildings and rooms
         buildings = [
@@ -247,7 +388,7 @@ class SampleDataLoader:
         ]
         
         for bid, name, address in buildings:
-            self.ontology.add_instance("Building", bid, {
+            self._add_instance("Building", bid, {
                 "name": name,
                 "address": address
             })
@@ -260,11 +401,11 @@ class SampleDataLoader:
         ]
         
         for rid, name, building in rooms:
-            self.ontology.add_instance("Room", rid, {
+            self._add_instance("Room", rid, {
                 "name": name,
                 "roomNumber": rid
             })
-            self.ontology.add_relationship(rid, "locatedIn", building)
+            self._add_relationship(rid, "locatedIn", building)
             
         # Labs
         labs = [
@@ -274,8 +415,8 @@ class SampleDataLoader:
         ]
         
         for lid, name, dept in labs:
-            self.ontology.add_instance("Lab", lid, {"name": name})
-            self.ontology.add_relationship(dept, "hasLab", lid)
+            self._add_instance("Lab", lid, {"name": name})
+            self._add_relationship(dept, "hasLab", lid)
             
         # Events
         events = [
@@ -285,9 +426,9 @@ class SampleDataLoader:
         ]
         
         for eid, name, date, dept in events:
-            self.ontology.add_instance("Event", eid, {
+            self._add_instance("Event", eid, {
                 "name": name,
-                "description": f"{name} event",
+                "description": name + _EVENT_SUFFIX,
                 "startDate": date
             })
-            self.ontology.add_relationship(eid, "organizedBy", dept)
\ No newline at end of file
+            self._add_relationship(eid, "organizedBy", dept)
\ No newline at end of file
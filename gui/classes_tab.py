@@ -2,9 +2,13 @@
 Classes tab implementation
 """
 
+import queue
+import threading
 import tkinter as tk
 from tkinter import ttk
 from tkinter import messagebox
+from rdflib import RDF, RDFS, OWL
+from rdflib.plugins.sparql import prepareQuery
 
 from config.settings import Colors, Fonts
 from gui.widgets import ToolTip
@@ -12,9 +16,63 @@ from gui.widgets import ToolTip
 class ClassesTab(ttk.Frame):
     """Classes tab showing ontology classes"""
     
+    POLL_MS = 50  # How often the main thread checks for worker results
+    
     def __init__(self, parent, app):
         super().__init__(parent)
         self.app = app
+        self._refresh_id = 0
+        # Workers hand (refresh_id, rows, error) back through this queue;
+        # only the main thread touches Tk
+        self._results = queue.Queue()
+        self._workers_running = 0
+        self._poll_job = None
+        self._search_after_id = None
+        # iid -> (lowercased class name, values) for every row, attached or not
+        self._row_cache = {}
+        self._iid_to_classname = {}
+        
+        # Parse the tab's queries once; the class is passed in as ?cls
+        ns = {'rdf': RDF, 'rdfs': RDFS, 'owl': OWL}
+        # Every class with its comment and both counts in a single query;
+        # the counts are grouped in subqueries so they don't multiply.
+        # Instances are counted by type alone: add_instance always asserts
+        # owl:NamedIndividual, so joining on it again only doubles the work
+        self._q_classes = prepareQuery("""
+            SELECT ?class ?comment ?icount ?scount
+            WHERE {
+                ?class rdf:type owl:Class .
+                OPTIONAL { ?class rdfs:comment ?comment }
+                OPTIONAL {
+                    SELECT ?class (COUNT(?instance) AS ?icount)
+                    WHERE {
+                        ?instance rdf:type ?class .
+                        FILTER(isIRI(?instance))
+                    }
+                    GROUP BY ?class
+                }
+                OPTIONAL {
+                    SELECT ?class (COUNT(?subclass) AS ?scount)
+                    WHERE { ?subclass rdfs:subClassOf ?class . }
+                    GROUP BY ?class
+                }
+            }
+            ORDER BY ?class
+            """, initNs=ns)
+        self._q_comment = prepareQuery(
+            "SELECT ?comment WHERE { ?cls rdfs:comment ?comment . }", initNs=ns)
+        self._q_instance_count = prepareQuery("""
+            SELECT (COUNT(?instance) as ?count)
+            WHERE {
+                ?instance rdf:type ?cls .
+                FILTER(isIRI(?instance))
+            }
+            """, initNs=ns)
+        self._q_subclass_count = prepareQuery("""
+            SELECT (COUNT(?subclass) as ?count)
+            WHERE { ?subclass rdfs:subClassOf ?cls . }
+            """, initNs=ns)
+        
         self.create_widgets()
         
     def create_widgets(self):
@@ -117,30 +175,34 @@ class ClassesTab(ttk.Frame):
         self.details_text.config(state=tk.DISABLED)
         
     def on_search(self, event=None):
-        """Handle search"""
+        """Handle search, filtering only once typing pauses"""
+        if self._search_after_id:
+            self.after_cancel(self._search_after_id)
+        self._search_after_id = self.after(150, self._do_search)
+        
+    def _do_search(self):
+        """Filter the tree by the current search term"""
+        self._search_after_id = None
         search_term = self.search_var.get().lower()
         
-        if not search_term:
-            # Show all items
-            for item in self.tree.get_children():
-                self.tree.item(item, tags=())
-            return
+        matches = []
+        non_matches = []
+        for iid, (text, _) in self._row_cache.items():
+            (matches if search_term in text else non_matches).append(iid)
             
-        # Hide non-matching items
-        for item in self.tree.get_children():
-            text = self.tree.item(item, 'text').lower()
-            if search_term in text:
-                self.tree.item(item, tags=('match',))
-            else:
-                self.tree.item(item, tags=('no_match',))
-                self.tree.detach(item)
+        # Detach the misses in one call and reattach the hits in row order,
+        # so clearing the search brings every row back
+        if non_matches:
+            self.tree.detach(*non_matches)
+        for index, iid in enumerate(matches):
+            self.tree.move(iid, '', index)
                 
     def on_item_double_click(self, event):
         """Handle double click on item"""
         selection = self.tree.selection()
         if selection:
             item = selection[0]
-            class_name = self.tree.item(item, 'text')
+            class_name = self._iid_to_classname.get(item)
             self.show_class_details(class_name)
             
     def on_item_select(self, event):
@@ -148,7 +210,7 @@ class ClassesTab(ttk.Frame):
         selection = self.tree.selection()
         if selection:
             item = selection[0]
-            class_name = self.tree.item(item, 'text')
+            class_name = self._iid_to_classname.get(item)
             self.update_details(class_name)
             
     def show_class_details(self, class_name):
@@ -161,38 +223,21 @@ class ClassesTab(ttk.Frame):
     def update_details(self, class_name):
         """Update details panel with class information"""
         # Get class details from ontology
-        query = f"""
-        SELECT ?comment
-        WHERE {{
-            univ:{class_name} rdfs:comment ?comment .
-        }}
-        """
+        ontology = self.app.ontology
+        bindings = {'cls': ontology.univ_ns[class_name]}
         
         try:
-            results = list(self.app.ontology.query(query))
+            results = list(ontology.query(self._q_comment, initBindings=bindings))
             comment = str(results[0]['comment']) if results else "No description available"
             
             # Get instance count
-            instance_query = f"""
-            SELECT (COUNT(?instance) as ?count)
-            WHERE {{
-                ?instance rdf:type univ:{class_name} .
-                ?instance rdf:type owl:NamedIndividual .
-            }}
-            """
-            
-            instance_results = list(self.app.ontology.query(instance_query))
+            instance_results = list(ontology.query(self._q_instance_count,
+                                                   initBindings=bindings))
             instance_count = int(instance_results[0]['count']) if instance_results else 0
             
             # Get subclass count
-            subclass_query = f"""
-            SELECT (COUNT(?subclass) as ?count)
-            WHERE {{
-                ?subclass rdfs:subClassOf univ:{class_name} .
-            }}
-            """
-            
-            subclass_results = list(self.app.ontology.query(subclass_query))
+            subclass_results = list(ontology.query(self._q_subclass_count,
+                                                   initBindings=bindings))
             subclass_count = int(subclass_results[0]['count']) if subclass_results else 0
             
             # Update details text
@@ -215,69 +260,104 @@ class ClassesTab(ttk.Frame):
             
     def refresh(self):
         """Refresh classes tree"""
-        # Clear existing items
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        # Query on a worker thread so the GUI stays responsive; only the
+        # newest refresh is applied if several are in flight. The thread is
+        # started from the event loop, so refreshes during startup wait until
+        # the initial data has been loaded
+        self._refresh_id += 1
+        self.after_idle(self._start_worker, self._refresh_id,
+                        self.show_instances_var.get())
+        
+    def _start_worker(self, refresh_id, show_instances):
+        """Start the query thread and begin polling for its result"""
+        if refresh_id != self._refresh_id:
+            return
+        self._workers_running += 1
+        threading.Thread(target=self._query_worker, args=(refresh_id, show_instances),
+                         daemon=True).start()
+        if self._poll_job is None:
+            self._poll_job = self.after(self.POLL_MS, self._poll_results)
             
-        # Get classes from ontology
-        query = """
-        SELECT ?class ?comment
-        WHERE {
-            ?class rdf:type owl:Class .
-            OPTIONAL { ?class rdfs:comment ?comment }
-        }
-        ORDER BY ?class
-        """
+    def _poll_results(self):
+        """Apply finished worker results on the main thread"""
+        self._poll_job = None
+        while True:
+            try:
+                refresh_id, rows, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._workers_running -= 1
+            if error:
+                messagebox.showerror("Error", f"Failed to load classes: {error}")
+            else:
+                self._apply_rows(refresh_id, rows)
+                
+        if self._workers_running:
+            self._poll_job = self.after(self.POLL_MS, self._poll_results)
+        
+    def _query_worker(self, refresh_id, show_instances):
+        """Build the class rows off the main thread"""
+        ontology = self.app.ontology
+        ns = ontology.namespace
+        ns_len = len(ns)
         
         try:
-            results = self.app.ontology.query(query)
-            
-            for row in results:
+            rows = []
+            for row in ontology.query(self._q_classes):
                 class_uri = str(row['class'])
-                class_name = class_uri.split('#')[-1]
+                # Slice off the ontology namespace; split only foreign URIs
+                if class_uri.startswith(ns):
+                    class_name = class_uri[ns_len:]
+                else:
+                    class_name = class_uri.split('#')[-1]
                 comment = str(row['comment']) if row['comment'] else ""
                 
-                # Get instance count if requested
+                # Instance count only if requested
                 instance_count = 0
-                if self.show_instances_var.get():
-                    instance_query = f"""
-                    SELECT (COUNT(?instance) as ?count)
-                    WHERE {{
-                        ?instance rdf:type <{class_uri}> .
-                        ?instance rdf:type owl:NamedIndividual .
-                    }}
-                    """
-                    
-                    instance_results = list(self.app.ontology.query(instance_query))
-                    if instance_results:
-                        instance_count = int(instance_results[0]['count'])
-                        
-                # Get subclass count
-                subclass_query = f"""
-                SELECT (COUNT(?subclass) as ?count)
-                WHERE {{
-                    ?subclass rdfs:subClassOf <{class_uri}> .
-                }}
-                """
+                if show_instances and row['icount'] is not None:
+                    instance_count = int(row['icount'])
+                subclass_count = int(row['scount']) if row['scount'] is not None else 0
                 
-                subclass_results = list(self.app.ontology.query(subclass_query))
-                subclass_count = int(subclass_results[0]['count']) if subclass_results else 0
-                
-                # Insert into tree
-                self.tree.insert('', tk.END, text=class_name,
-                               values=(comment, instance_count, subclass_count))
-                               
+                rows.append((class_name, comment, instance_count, subclass_count))
         except Exception as e:
-            messagebox.showerror("Error", f"Failed to load classes: {str(e)}")
+            self._results.put((refresh_id, None, str(e)))
+            return
+            
+        self._results.put((refresh_id, rows, None))
+        
+    def _apply_rows(self, refresh_id, rows):
+        """Replace the tree contents with rows from the worker"""
+        if refresh_id != self._refresh_id:
+            return
             
+        tree = self.tree
+        # Hide the columns while inserting so Tk redraws once at the end
+        tree.configure(displaycolumns=())
+        # Rows hidden by a search are detached, so delete them by id
+        if self._row_cache:
+            tree.delete(*self._row_cache)
+        row_cache = {}
+        iid_to_classname = {}
+        insert = tree.insert
+        for class_name, comment, instance_count, subclass_count in rows:
+            values = (comment, instance_count, subclass_count)
+            iid = insert('', tk.END, text=class_name, values=values)
+            row_cache[iid] = (class_name.lower(), values)
+            iid_to_classname[iid] = class_name
+        self._row_cache = row_cache
+        self._iid_to_classname = iid_to_classname
+        if self.search_var.get():
+            self._do_search()
+        tree.configure(displaycolumns='#all')
+        
     def add_class(self):
         """Add new class"""
-        from gui.dialogs import BaseDialog
-        import tkinter.simpledialog as sd
+        from gui.dialogs import AddClassDialog
         
-        class_name = sd.askstring("Add Class", "Enter class name:")
-        if class_name:
-            description = sd.askstring("Add Class", "Enter description (optional):")
+        result = AddClassDialog(self.winfo_toplevel()).show()
+        if result:
+            class_name = result['name']
+            description = result['description']
             
             try:
                 # In a real implementation, you would add the class to the ontology
@@ -297,7 +377,7 @@ class ClassesTab(ttk.Frame):
             return
             
         item = selection[0]
-        class_name = self.tree.item(item, 'text')
+        class_name = self._iid_to_classname.get(item)
         
         confirm = messagebox.askyesno("Confirm Delete",
                                      f"Delete class '{class_name}'?\n\n"
@@ -2,39 +2,101 @@
 Dashboard tab implementation
 """
 
+import json
+import logging
+import os
+import time
 import tkinter as tk
+from functools import partial
 from tkinter import ttk
 from datetime import datetime
 
-from config.settings import Colors, Fonts
+from config.settings import CACHE_DIR, Colors, Fonts
 from gui.widgets import CardWidget, StatWidget, RecentActivityWidget
 
+logger = logging.getLogger(__name__)
+
+# Last-seen statistics and activity, painted on startup until fresh data is in
+STATE_CACHE_PATH = os.path.join(CACHE_DIR, 'dashboard_state.json')
+STATE_CACHE_MAX_AGE = 24 * 60 * 60  # seconds
+
+# Quick action buttons: (label, name of the app method to call, its
+# arguments, color)
+_QUICK_ACTIONS = (
+    ("Add Student", "open_add_instance", ("Student",), Colors.SUCCESS),
+    ("Add Professor", "open_add_instance", ("Professor",), Colors.PRIMARY),
+    ("Add Course", "open_add_instance", ("Course",), Colors.WARNING),
+    ("Run Query", "open_sparql_editor", (), Colors.INFO),
+    ("View Graph", "show_instance_graph", (), Colors.ACCENT),
+    ("Export Data", "export_turtle", (), Colors.SECONDARY),
+    ("Statistics", "show_statistics", (), Colors.INFO),
+    ("Refresh All", "refresh_all_views", (), Colors.WARNING),
+)
+
+# Placeholder entries for the recent activity list: (activity, details, time)
+_SAMPLE_ACTIVITIES = (
+    ("Added new course", "CS401 - Machine Learning", "2 minutes ago"),
+    ("Updated student record", "Alice Johnson - GPA updated", "5 minutes ago"),
+    ("Added relationship", "ProfSmith teaches CS301", "10 minutes ago"),
+    ("Exported data", "Ontology exported as Turtle", "15 minutes ago"),
+)
+
+# System status rows: (label, value, color)
+_STATUS_ITEMS = (
+    ("Ontology Status", "Healthy", Colors.SUCCESS),
+    ("Memory Usage", "45%", Colors.INFO),
+    ("Query Cache", "Enabled", Colors.SUCCESS),
+    ("Visualization Engine", "Ready", Colors.SUCCESS),
+)
+
 class DashboardTab(ttk.Frame):
     """Dashboard tab showing overview and quick actions"""
     
+    REFRESH_INTERVAL_MS = 300  # Minimum spacing between refreshes
+    
     def __init__(self, parent, app):
         super().__init__(parent)
         self.app = app
+        self._last_refresh_ts = 0.0
+        self._refresh_job = None
+        self._is_visible = False
+        self._tick_job = None
+        self._shown_updated_at = None
+        parent.bind('<<NotebookTabChanged>>', self._on_notebook_tab_changed, add='+')
+        self._stats_cache = None  # (ontology version, stats, computed at)
+        self._lazy_sections = {}  # name -> (placeholder frame, builder)
+        self._built = {}
+        self._sr_job = None
+        self._wheel_delta = 0
+        self._wheel_job = None
+        self._last_status_hash = None
+        self._disk_state = self._load_disk_state()
         self.create_widgets()
+        if self._disk_state:
+            # Painted from the cache; fetch the real statistics right after
+            self.after(50, self._refresh_stats)
         
     def create_widgets(self):
         """Create dashboard widgets"""
         # Create scrollable canvas
-        canvas = tk.Canvas(self, bg=Colors.DARK)
-        scrollbar = ttk.Scrollbar(self, orient="vertical", command=canvas.yview)
+        self.canvas = canvas = tk.Canvas(self, bg=Colors.DARK)
+        self.scrollbar = scrollbar = ttk.Scrollbar(self, orient="vertical", command=canvas.yview)
         scrollable_frame = ttk.Frame(canvas)
         
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-        )
+        scrollable_frame.bind("<Configure>", self._on_frame_configure)
         
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
+        self._inner_id = canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
+        canvas.configure(yscrollcommand=self._on_yscroll)
+        canvas.bind("<Configure>", self._on_canvas_configure)
         
         canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
         
+        # Wheel events go to the widget under the pointer, so capture them
+        # globally only while the pointer is over the dashboard
+        canvas.bind("<Enter>", self._bind_wheel)
+        canvas.bind("<Leave>", self._unbind_wheel)
+        
         # Header
         header_frame = ttk.Frame(scrollable_frame)
         header_frame.pack(fill=tk.X, padx=20, pady=20)
@@ -44,10 +106,14 @@ class DashboardTab(ttk.Frame):
                                style='Title.TLabel')
         title_label.pack(pady=10)
         
-        subtitle_label = ttk.Label(header_frame,
-                                  text=f"Last updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
-                                  style='Subtitle.TLabel')
-        subtitle_label.pack(pady=5)
+        self.subtitle_label = ttk.Label(header_frame, style='Subtitle.TLabel')
+        self.subtitle_label.pack(pady=5)
+        if self._disk_state:
+            cached_at = datetime.fromtimestamp(self._disk_state['ts'])
+            self.subtitle_label.configure(
+                text=f"Last updated: {cached_at:%Y-%m-%d %H:%M:%S} (cached)")
+        else:
+            self._update_subtitle()
         
         # Statistics cards
         self.create_statistics_cards(scrollable_frame)
@@ -55,56 +121,140 @@ class DashboardTab(ttk.Frame):
         # Quick actions
         self.create_quick_actions(scrollable_frame)
         
-        # Recent activity
-        self.create_recent_activity(scrollable_frame)
+        # Recent activity and system status are built the first time their
+        # placeholder scrolls into view
+        for name, builder in (('activity', self.create_recent_activity),
+                              ('status', self.create_system_status)):
+            stub = ttk.Frame(scrollable_frame)
+            stub.pack(fill=tk.X)
+            self._lazy_sections[name] = (stub, builder)
+            self._built[name] = False
+            
+    def _on_frame_configure(self, event=None):
+        """Coalesce content resizes into one scrollregion update per idle pass"""
+        if self._sr_job is not None:
+            self.after_cancel(self._sr_job)
+        self._sr_job = self.after_idle(self._update_scrollregion)
+        
+    def _on_canvas_configure(self, event):
+        """Keep the content as wide as the canvas and reveal uncovered sections"""
+        self.canvas.itemconfigure(self._inner_id, width=event.width)
+        self._reveal_sections()
+        
+    def _update_scrollregion(self):
+        """Fit the scrollregion to the content and build newly visible sections"""
+        self._sr_job = None
+        self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+        self._reveal_sections()
         
-        # System status
-        self.create_system_status(scrollable_frame)
+    def _on_yscroll(self, first, last):
+        """Forward the scroll position and build sections scrolled into view"""
+        self.scrollbar.set(first, last)
+        self._reveal_sections()
+        
+    def _bind_wheel(self, event=None):
+        """Route mouse wheel events to the dashboard canvas"""
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.canvas.bind_all(sequence, self._accum_wheel)
+            
+    def _unbind_wheel(self, event=None):
+        """Stop routing mouse wheel events to the dashboard canvas"""
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.canvas.unbind_all(sequence)
+            
+    def _accum_wheel(self, event):
+        """Accumulate wheel deltas and scroll at most once per 16 ms"""
+        if event.num == 4:
+            self._wheel_delta += 120
+        elif event.num == 5:
+            self._wheel_delta -= 120
+        else:
+            self._wheel_delta += event.delta
+        if self._wheel_job is None:
+            self._wheel_job = self.after(16, self._flush_wheel)
+            
+    def _flush_wheel(self):
+        """Scroll by the whole notches accumulated since the last flush"""
+        self._wheel_job = None
+        units = int(self._wheel_delta / 120)
+        self._wheel_delta -= units * 120
+        if units:
+            self.canvas.yview_scroll(-units, "units")
+            
+    def _reveal_sections(self):
+        """Build each lazy section once its placeholder is in the viewport"""
+        bottom = self.canvas.canvasy(0) + self.canvas.winfo_height()
+        for name, (stub, builder) in self._lazy_sections.items():
+            if not self._built[name] and stub.winfo_y() < bottom:
+                self._built[name] = True
+                builder(stub)
         
     def create_statistics_cards(self, parent):
         """Create statistics cards"""
         stats_frame = ttk.LabelFrame(parent, text="Ontology Statistics", padding=10)
         stats_frame.pack(fill=tk.X, padx=20, pady=10)
         
-        # Get statistics
-        stats = self.app.ontology.get_statistics()
+        # Get statistics, from the last session if it was cached
+        if self._disk_state:
+            stats = self._disk_state['stats']
+        else:
+            stats, _ = self.get_statistics()
         
         # Create stat cards
+        PRIMARY, SUCCESS, WARNING, ACCENT = (Colors.PRIMARY, Colors.SUCCESS,
+                                             Colors.WARNING, Colors.ACCENT)
         stats_data = [
-            ("Classes", stats['classes'], Colors.PRIMARY, "Total classes in ontology"),
-            ("Instances", stats['instances'], Colors.SUCCESS, "Total instances"),
-            ("Relationships", stats['relationships'], Colors.WARNING, "Total relationships"),
+            ("Classes", stats['classes'], PRIMARY, "Total classes in ontology"),
+            ("Instances", stats['instances'], SUCCESS, "Total instances"),
+            ("Relationships", stats['relationships'], WARNING, "Total relationships"),
             ("Properties", stats['object_properties'] + stats['data_properties'],
-             Colors.ACCENT, "Object + Data properties")
+             ACCENT, "Object + Data properties")
         ]
         
+        self._stat_cards = {}
         for i, (title, value, color, description) in enumerate(stats_data):
             card = StatWidget(stats_frame, title, value, color, description)
             card.grid(row=0, column=i, padx=5, pady=5, sticky='nsew')
-            stats_frame.columnconfigure(i, weight=1)
+            self._stat_cards[title] = card
+        for column in range(len(stats_data)):
+            stats_frame.columnconfigure(column, weight=1)
+        self._lock_size(stats_frame)
             
+    def _update_statistics_cards(self, stats):
+        """Write new numbers into the existing stat cards"""
+        values = {
+            "Classes": stats['classes'],
+            "Instances": stats['instances'],
+            "Relationships": stats['relationships'],
+            "Properties": stats['object_properties'] + stats['data_properties']
+        }
+        for title, value in values.items():
+            self._stat_cards[title].update_value(value)
+            
+    def get_statistics(self):
+        """Return (stats, computed_at), recomputing only when the ontology changed"""
+        ontology = self.app.ontology
+        cache = self._stats_cache
+        if cache is None or cache[0] != ontology.version:
+            stats = ontology.get_statistics()
+            cache = self._stats_cache = (ontology.version, stats, datetime.now())
+        return cache[1], cache[2]
+        
     def create_quick_actions(self, parent):
         """Create quick actions section"""
         actions_frame = ttk.LabelFrame(parent, text="Quick Actions", padding=10)
         actions_frame.pack(fill=tk.X, padx=20, pady=10)
         
-        actions = [
-            ("Add Student", self.app.open_add_instance, Colors.SUCCESS),
-            ("Add Professor", self.app.open_add_instance, Colors.PRIMARY),
-            ("Add Course", self.app.open_add_instance, Colors.WARNING),
-            ("Run Query", self.app.open_sparql_editor, Colors.INFO),
-            ("View Graph", self.app.show_instance_graph, Colors.ACCENT),
-            ("Export Data", self.app.export_turtle, Colors.SECONDARY),
-            ("Statistics", self.app.show_statistics, Colors.INFO),
-            ("Refresh All", self.app.refresh_all_views, Colors.WARNING)
-        ]
-        
-        for i, (text, command, color) in enumerate(actions):
-            btn = ttk.Button(actions_frame, text=text,
-                           command=lambda c=command: c(),
+        for i, (text, method, args, color) in enumerate(_QUICK_ACTIONS):
+            command = getattr(self.app, method)
+            if args:
+                command = partial(command, *args)
+            btn = ttk.Button(actions_frame, text=text, command=command,
                            style='Primary.TButton')
             btn.grid(row=i // 4, column=i % 4, padx=5, pady=5, sticky='ew')
-            actions_frame.columnconfigure(i % 4, weight=1)
+        for column in range(4):
+            actions_frame.columnconfigure(column, weight=1)
+        self._lock_size(actions_frame)
             
     def create_recent_activity(self, parent):
         """Create recent activity section"""
@@ -115,47 +265,141 @@ class DashboardTab(ttk.Frame):
         self.activity_widget = RecentActivityWidget(activity_frame)
         self.activity_widget.pack(fill=tk.X, expand=True)
         
-        # Add sample activities
-        sample_activities = [
-            ("Added new course", "CS401 - Machine Learning", "2 minutes ago"),
-            ("Updated student record", "Alice Johnson - GPA updated", "5 minutes ago"),
-            ("Added relationship", "ProfSmith teaches CS301", "10 minutes ago"),
-            ("Exported data", "Ontology exported as Turtle", "15 minutes ago")
-        ]
-        
-        for activity, details, time in sample_activities:
-            self.activity_widget.add_activity(activity, details, time)
+        # Add the cached activities, or the samples on a cold start
+        activities = _SAMPLE_ACTIVITIES
+        if self._disk_state:
+            activities = self._disk_state['activities']
+        for activity, details, when in activities:
+            self.activity_widget.add_activity(activity, details, when)
             
     def create_system_status(self, parent):
         """Create system status section"""
         status_frame = ttk.LabelFrame(parent, text="System Status", padding=10)
         status_frame.pack(fill=tk.X, padx=20, pady=10)
         
-        status_items = [
-            ("Ontology Status", "Healthy", Colors.SUCCESS),
-            ("Memory Usage", "45%", Colors.INFO),
-            ("Query Cache", "Enabled", Colors.SUCCESS),
-            ("Visualization Engine", "Ready", Colors.SUCCESS)
-        ]
-        
-        for i, (label, value, color) in enumerate(status_items):
+        BODY, HEADING = Fonts.BODY_NAME, Fonts.HEADING_NAME
+        for i, (label, value, color) in enumerate(_STATUS_ITEMS):
             frame = ttk.Frame(status_frame)
             frame.grid(row=i // 2, column=i % 2, padx=5, pady=5, sticky='ew')
             
-            ttk.Label(frame, text=label, font=Fonts.BODY).pack(anchor=tk.W)
-            ttk.Label(frame, text=value, font=Fonts.HEADING,
+            ttk.Label(frame, text=label, font=BODY).pack(anchor=tk.W)
+            ttk.Label(frame, text=value, font=HEADING,
                      foreground=color).pack(anchor=tk.W)
+        self._lock_size(status_frame)
+        
+    def _lock_size(self, frame):
+        """Fix a section at its laid-out size so refreshes don't re-fit it"""
+        frame.update_idletasks()
+        width, height = frame.winfo_reqwidth(), frame.winfo_reqheight()
+        frame.grid_propagate(False)
+        frame.configure(width=width, height=height)
                      
     def on_tab_selected(self):
         """Called when tab is selected"""
+        self._is_visible = True
         self.refresh()
+        if self._tick_job is None:
+            self._tick()
+            
+    def _update_subtitle(self):
+        """Show when the displayed statistics were computed, if that changed"""
+        _, computed_at = self.get_statistics()
+        if computed_at != self._shown_updated_at:
+            self._shown_updated_at = computed_at
+            self.subtitle_label.configure(text=f"Last updated: {computed_at:%Y-%m-%d %H:%M:%S}")
+            
+    def _tick(self):
+        """Update the subtitle once a second while the tab is visible"""
+        self._tick_job = None
+        if not self._is_visible:
+            return
+        self._update_subtitle()
+        self._tick_job = self.after(1000, self._tick)
         
+    def _on_notebook_tab_changed(self, event):
+        """Track whether the dashboard is the selected notebook tab"""
+        self._is_visible = event.widget.select() == str(self)
+        if not self._is_visible:
+            for job in (self._refresh_job, self._tick_job):
+                if job is not None:
+                    self.after_cancel(job)
+            self._refresh_job = self._tick_job = None
+            
     def refresh(self):
         """Refresh dashboard data"""
+        # Nothing to redraw while hidden; on_tab_selected refreshes on return
+        if not self._is_visible:
+            return
+            
+        # Coalesce bursts of refreshes: inside the interval only schedule one
+        # trailing refresh so the final state still gets rendered
+        now = time.monotonic()
+        if (now - self._last_refresh_ts) * 1000 < self.REFRESH_INTERVAL_MS:
+            if self._refresh_job is None:
+                self._refresh_job = self.after(self.REFRESH_INTERVAL_MS,
+                                               self._deferred_refresh)
+            return
+        self._last_refresh_ts = now
+        
         # Update statistics
         if hasattr(self, 'activity_widget'):
             self.activity_widget.clear()
             # Add new activities here if tracking was implemented
             
-        # Update status bar via main app
-        self.app.update_status_bar()
\ No newline at end of file
+        self._refresh_stats()
+        
+    def _refresh_stats(self):
+        """Fetch the statistics and show them"""
+        # Reading the counters is cheap, and a recount must not race with
+        # mutations, so this stays on the Tk thread
+        try:
+            stats, _ = self.get_statistics()
+        except Exception:
+            return
+        self._apply_stats(stats)
+        
+    def _apply_stats(self, stats):
+        """Show freshly fetched statistics on the cards, subtitle and status bar"""
+        # Nothing to write if the numbers match what is already shown
+        status_hash = hash(tuple(sorted(stats.items())))
+        if status_hash == self._last_status_hash:
+            return
+        self._last_status_hash = status_hash
+        
+        self._update_statistics_cards(stats)
+        self._update_subtitle()
+        self.app.update_status_bar(stats)
+        self._save_disk_state(stats)
+        
+    def _load_disk_state(self):
+        """Read the dashboard state cached by a recent session, if any"""
+        try:
+            with open(STATE_CACHE_PATH, encoding='utf-8') as f:
+                state = json.load(f)
+            if time.time() - state['ts'] < STATE_CACHE_MAX_AGE:
+                return state
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        return None
+        
+    def _save_disk_state(self, stats):
+        """Cache the displayed statistics and activities for the next start"""
+        if hasattr(self, 'activity_widget'):
+            activities = self.activity_widget.activities
+        elif self._disk_state:
+            activities = self._disk_state['activities']
+        else:
+            activities = _SAMPLE_ACTIVITIES
+        state = {'ts': time.time(), 'stats': stats, 'activities': list(activities)}
+        
+        try:
+            os.makedirs(os.path.dirname(STATE_CACHE_PATH), exist_ok=True)
+            with open(STATE_CACHE_PATH, 'w', encoding='utf-8') as f:
+                json.dump(state, f)
+        except OSError as e:
+            logger.warning(f"Could not cache dashboard state: {e}")
+        
+    def _deferred_refresh(self):
+        """Run the trailing refresh scheduled by a throttled call"""
+        self._refresh_job = None
+        self.refresh()
\ No newline at end of file
@@ -3,23 +3,84 @@ Dialog windows for the application
 """
 
 import tkinter as tk
-from tkinter import ttk, messagebox, filedialog, simpledialog
+from tkinter import ttk, messagebox
 import os
+import copy
+import bisect
+import threading
 from datetime import datetime
 import json
+from functools import partial
+from itertools import islice
+from operator import itemgetter
+import numpy as np
+import csv
+import io
+from rdflib import RDF, RDFS, OWL, XSD, Literal
+from rdflib.plugins.sparql import prepareQuery
 
-from config.settings import Colors, Fonts
-from core.ontology import UniversityOntology
-from core.query_engine import QueryEngine
-from utils.helpers import format_date, generate_id
-# Re-export additional dialogs implemented in dialogs_extra for convenience
-try:
-    from gui.dialogs_extra import QueryBuilderDialog, ExamplesDialog, PreferencesDialog
-except Exception:
-    # Fallback: ignore if dialogs_extra not available at import time
-    QueryBuilderDialog = None
-    ExamplesDialog = None
-    PreferencesDialog = None
+from core.ontology import FORMAT_BY_EXTENSION
+from gui.widgets import ToolTip
+from utils.helpers import generate_id
+
+# Re-export additional dialogs implemented in dialogs_extra for convenience;
+# the module is only imported when one of them is first looked up
+_EXTRA_DIALOGS = ('QueryBuilderDialog', 'ExamplesDialog', 'PreferencesDialog')
+
+def __getattr__(name):
+    if name not in _EXTRA_DIALOGS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    try:
+        import gui.dialogs_extra as extra
+        value = getattr(extra, name)
+    except Exception:
+        # Fallback: ignore if dialogs_extra is not available
+        value = None
+    globals()[name] = value
+    return value
+
+# Dialog queries are parsed once at import; per-call values such as the
+# ontology's own IRIs are passed in through initBindings. Plain type lookups
+# skip SPARQL and walk the graph's triple index directly.
+_NS = {'rdf': RDF, 'rdfs': RDFS, 'owl': OWL}
+_Q_CLASS_PROPERTIES = prepareQuery("""
+    SELECT ?class ?prop ?datatype ?comment
+    WHERE {
+        ?prop rdf:type owl:DatatypeProperty .
+        ?prop rdfs:domain ?class .
+        ?prop rdfs:range ?datatype .
+        OPTIONAL { ?prop rdfs:comment ?comment }
+    }
+    """, initNs=_NS)
+_Q_PREDICATE_RANGE = prepareQuery("""
+    SELECT ?range
+    WHERE {
+        ?predicate rdfs:range ?range .
+    }
+    LIMIT 1
+    """, initNs=_NS)
+_Q_INSTANCES_OF = prepareQuery("""
+    SELECT ?instance
+    WHERE {
+        ?instance rdf:type ?range .
+        ?instance rdf:type owl:NamedIndividual .
+    }
+    """, initNs=_NS)
+
+# Input widget and options per property datatype; anything else gets an Entry
+_PROPERTY_INPUTS = {
+    'integer': (ttk.Spinbox, {'from_': 0, 'to': 10000, 'width': 28}),
+    'float': (ttk.Spinbox, {'from_': 0.0, 'to': 10000.0, 'increment': 0.1, 'width': 28}),
+}
+_DEFAULT_INPUT = (ttk.Entry, {'width': 30})
+
+def _shorten(value):
+    """Local name of a URI: the part after the last '#', else the last '/'"""
+    # rpartition builds no intermediate list, and rdflib terms are already
+    # str; only a term without separators comes back as itself
+    s = value if isinstance(value, str) else str(value)
+    _, sep, name = s.rpartition('#')
+    return name if sep else str(s.rpartition('/')[2])
 
 class BaseDialog:
     """Base class for dialog windows"""
@@ -27,18 +88,20 @@ class BaseDialog:
     def __init__(self, parent, title="Dialog", width=400, height=300):
         self.dialog = tk.Toplevel(parent)
         self.dialog.title(title)
-        self.dialog.geometry(f"{width}x{height}")
-        self.dialog.resizable(False, False)
-        self.dialog.transient(parent)
-        self.dialog.grab_set()
         
-        # Center dialog
-        self.dialog.update_idletasks()
-        x = parent.winfo_x() + (parent.winfo_width() // 2) - (width // 2)
-        y = parent.winfo_y() + (parent.winfo_height() // 2) - (height // 2)
+        # Center over the parent with a single geometry call; only the
+        # already mapped parent needs its layout settled
+        parent.update_idletasks()
+        x = parent.winfo_rootx() + (parent.winfo_width() // 2) - (width // 2)
+        y = parent.winfo_rooty() + (parent.winfo_height() // 2) - (height // 2)
         self.dialog.geometry(f"{width}x{height}+{x}+{y}")
+        self.dialog.resizable(False, False)
+        self.dialog.transient(parent)
+        # Grab once the window is mapped rather than blocking on it here
+        self.dialog.after_idle(self._grab)
         
         self.result = None
+        self._tab_builders = {}  # tab frame path -> builder, until first shown
         # Note: do not call create_widgets() here because subclasses may need
         # to set attributes (e.g. ontology, query_engine) before widgets are
         # created. Subclasses should call self.create_widgets() after their
@@ -48,6 +111,30 @@ class BaseDialog:
         """Create dialog widgets (to be overridden)"""
         pass
         
+    def add_lazy_tab(self, notebook, text, builder):
+        """Add a notebook tab whose contents are built when first selected"""
+        frame = ttk.Frame(notebook)
+        notebook.add(frame, text=text)
+        self._tab_builders[str(frame)] = (builder, frame)
+        return frame
+        
+    def build_selected_tab(self, event=None, notebook=None):
+        """Build the selected tab if it hasn't been shown yet"""
+        notebook = notebook or event.widget
+        entry = self._tab_builders.pop(str(notebook.select()), None)
+        if entry:
+            builder, frame = entry
+            builder(frame)
+            
+    def _grab(self):
+        """Make the dialog modal once it is visible"""
+        try:
+            self.dialog.wait_visibility()
+            self.dialog.grab_set()
+        except tk.TclError:
+            # Closed before it was shown
+            pass
+        
     def show(self):
         """Show dialog and wait for result"""
         self.dialog.wait_window()
@@ -56,12 +143,19 @@ class BaseDialog:
 class AddInstanceDialog(BaseDialog):
     """Dialog for adding new instances"""
     
-    def __init__(self, parent, ontology):
+    def __init__(self, parent, ontology, class_name=None):
         # store required attributes before creating widgets
         self.ontology = ontology
+        self.initial_class = class_name
         self.class_var = tk.StringVar()
         self.instance_id_var = tk.StringVar()
         self.properties = {}
+        self._props_by_class = self.load_class_properties()
+        self._last_class = None
+        # Property rows are reused across class changes instead of rebuilt
+        self._label_pool = []
+        self._input_pool = {}  # datatype kind -> [(input, tooltip)]
+        self._shown_rows = []
         super().__init__(parent, "Add New Instance", 500, 400)
         # create widgets now that attributes are set
         self.create_widgets()
@@ -80,7 +174,9 @@ class AddInstanceDialog(BaseDialog):
         class_combo.grid(row=0, column=1, sticky=tk.W, pady=5, padx=(10, 0))
         class_combo.bind('<<ComboboxSelected>>', self.on_class_selected)
         
-        if classes:
+        if self.initial_class in classes:
+            class_combo.set(self.initial_class)
+        elif classes:
             class_combo.set(classes[0])
             
         # Instance ID
@@ -113,106 +209,89 @@ class AddInstanceDialog(BaseDialog):
         
     def get_classes(self):
         """Get list of available classes"""
-        query = """
-        SELECT ?class
-        WHERE {
-            ?class rdf:type owl:Class .
-        }
-        ORDER BY ?class
-        """
-        
-        results = self.ontology.query(query)
-        classes = []
-        
-        for row in results:
-            class_uri = str(row['class'])
-            class_name = class_uri.split('#')[-1]
-            classes.append(class_name)
-            
-        return sorted(classes)
+        graph = self.ontology.graph
+        return sorted({_shorten(c) for c in graph.subjects(RDF.type, OWL.Class)})
         
     def on_class_selected(self, event=None):
         """Update properties when class is selected"""
-        # Clear existing properties
-        for widget in self.props_frame.winfo_children():
-            widget.destroy()
-            
         class_name = self.class_var.get()
+        if class_name == self._last_class:
+            return
+        self._last_class = class_name
+        
+        # Hide the current property rows; they go back to the pools
+        for widget in self._shown_rows:
+            widget.grid_forget()
+        self._shown_rows = []
+        self.property_entries = {}
+            
         if not class_name:
             return
             
         # Get properties for this class
         properties = self.get_class_properties(class_name)
         
-        self.property_entries = {}
-        
-        # Create property fields
+        # Show property fields, creating widgets only when the pools run out
+        used = {}
         for i, (prop_name, prop_info) in enumerate(properties):
-            ttk.Label(self.props_frame, text=f"{prop_name}:").grid(
-                row=i, column=0, sticky=tk.W, pady=2, padx=5)
-                
-            if prop_info.get('datatype', '').endswith('string'):
-                entry = ttk.Entry(self.props_frame, width=30)
-            elif prop_info.get('datatype', '').endswith('integer'):
-                entry = ttk.Spinbox(self.props_frame, from_=0, to=10000, width=28)
-            elif prop_info.get('datatype', '').endswith('float'):
-                entry = ttk.Spinbox(self.props_frame, from_=0.0, to=10000.0, 
-                                   increment=0.1, width=28)
-            elif prop_info.get('datatype', '').endswith('date'):
-                entry = ttk.Entry(self.props_frame, width=30)
-                # In real implementation, add date picker
-            else:
-                entry = ttk.Entry(self.props_frame, width=30)
-                
+            if i == len(self._label_pool):
+                self._label_pool.append(ttk.Label(self.props_frame))
+            label = self._label_pool[i]
+            label.configure(text=f"{prop_name}:")
+            label.grid(row=i, column=0, sticky=tk.W, pady=2, padx=5)
+            
+            # Dates use a plain Entry too; a date picker could slot in here
+            datatype = prop_info.get('datatype', '')
+            kind = datatype if datatype in _PROPERTY_INPUTS else None
+            pool = self._input_pool.setdefault(kind, [])
+            n = used.get(kind, 0)
+            used[kind] = n + 1
+            if n == len(pool):
+                widget_class, options = _PROPERTY_INPUTS.get(kind, _DEFAULT_INPUT)
+                entry = widget_class(self.props_frame, **options)
+                pool.append((entry, ToolTip(entry, "")))
+            entry, tooltip = pool[n]
+            entry.delete(0, tk.END)
             entry.grid(row=i, column=1, sticky=tk.W, pady=2, padx=5)
             
-            # Add tooltip with description
-            if prop_info.get('comment'):
-                from gui.widgets import ToolTip
-                ToolTip(entry, prop_info['comment'])
+            # Tooltip with description
+            tooltip.text = prop_info.get('comment', '')
                 
+            self._shown_rows += (label, entry)
             self.property_entries[prop_name] = entry
             
-    def get_class_properties(self, class_name):
-        """Get properties for a class"""
-        # Common properties for all classes
-        common_props = [
-            ("name", {"datatype": "string", "comment": "Name of the instance"}),
-            ("description", {"datatype": "string", "comment": "Description"}),
-            ("id", {"datatype": "string", "comment": "Unique identifier"})
-        ]
-        
-        # Get specific properties for this class
-        query = f"""
-        SELECT ?prop ?datatype ?comment
-        WHERE {{
-            ?prop rdf:type owl:DatatypeProperty .
-            ?prop rdfs:domain univ:{class_name} .
-            ?prop rdfs:range ?datatype .
-            OPTIONAL {{ ?prop rdfs:comment ?comment }}
-        }}
-        """
-        
-        specific_props = []
+    def load_class_properties(self):
+        """Bucket every class's datatype properties with a single query"""
+        props_by_class = {}
         try:
-            results = self.ontology.query(query)
+            results = self.ontology.cached_query(_Q_CLASS_PROPERTIES)
             for row in results:
-                prop_name = str(row['prop']).split('#')[-1]
-                datatype = str(row['datatype']).split('#')[-1] if row['datatype'] else "string"
+                class_name = _shorten(row['class'])
+                prop_name = _shorten(row['prop'])
+                datatype = _shorten(row['datatype']) if row['datatype'] else "string"
                 comment = str(row['comment']) if row['comment'] else ""
                 
-                specific_props.append((prop_name, {
+                props_by_class.setdefault(class_name, []).append((prop_name, {
                     "datatype": datatype,
                     "comment": comment
                 }))
         except:
             pass
             
-        # Combine and remove duplicates
-        all_props = {}
-        for prop_name, prop_info in common_props + specific_props:
-            if prop_name not in all_props:
-                all_props[prop_name] = prop_info
+        return props_by_class
+        
+    def get_class_properties(self, class_name):
+        """Get properties for a class"""
+        # Common properties for all classes
+        all_props = {
+            "name": {"datatype": "string", "comment": "Name of the instance"},
+            "description": {"datatype": "string", "comment": "Description"},
+            "id": {"datatype": "string", "comment": "Unique identifier"}
+        }
+        
+        # Add the class's own properties, the first occurrence of a name wins
+        for prop_name, prop_info in self._props_by_class.get(class_name, ()):
+            all_props.setdefault(prop_name, prop_info)
                 
         return list(all_props.items())
         
@@ -255,9 +334,12 @@ class AddInstanceDialog(BaseDialog):
 class AddRelationshipDialog(BaseDialog):
     """Dialog for adding new relationships"""
     
+    MAX_SUGGESTIONS = 50
+    
     def __init__(self, parent, ontology):
         # set attributes first
         self.ontology = ontology
+        self._choices = {}  # combobox -> sorted candidate names
         super().__init__(parent, "Add New Relationship", 450, 300)
         self.create_widgets()
         
@@ -288,6 +370,9 @@ class AddRelationshipDialog(BaseDialog):
                                         width=30)
         self.object_combo.grid(row=2, column=1, sticky=tk.W, pady=5, padx=(10, 0))
         
+        for combo in (self.subject_combo, self.object_combo):
+            combo.bind('<KeyRelease>', self.on_type)
+        
         # Load data
         self.load_instances()
         self.load_predicates()
@@ -302,44 +387,36 @@ class AddRelationshipDialog(BaseDialog):
         
     def load_instances(self):
         """Load instances into comboboxes"""
-        query = """
-        SELECT ?instance
-        WHERE {
-            ?instance rdf:type owl:NamedIndividual .
-        }
-        ORDER BY ?instance
-        """
-        
-        results = self.ontology.query(query)
-        instances = []
-        
-        for row in results:
-            instance_uri = str(row['instance'])
-            instance_id = instance_uri.split('#')[-1]
-            instances.append(instance_id)
-            
-        self.subject_combo['values'] = sorted(instances)
-        self.object_combo['values'] = sorted(instances)
+        graph = self.ontology.graph
+        self._instances_sorted = sorted(
+            {_shorten(i) for i in graph.subjects(RDF.type, OWL.NamedIndividual)})
+        self._set_choices(self.subject_combo, self._instances_sorted)
+        self._set_choices(self.object_combo, self._instances_sorted)
+        
+    def _set_choices(self, combo, names):
+        """Set the sorted candidates a combobox suggests from"""
+        self._choices[combo] = names
+        combo['values'] = names
+        
+    def on_type(self, event):
+        """Narrow the dropdown to names starting with the typed prefix"""
+        combo = event.widget
+        names = self._choices.get(combo)
+        if names is None:
+            return
+        prefix = combo.get()
+        if not prefix:
+            combo['values'] = names
+            return
+        lo = bisect.bisect_left(names, prefix)
+        hi = bisect.bisect_left(names, prefix + '\uffff', lo)
+        combo['values'] = names[lo:min(hi, lo + self.MAX_SUGGESTIONS)]
         
     def load_predicates(self):
         """Load predicates into combobox"""
-        query = """
-        SELECT ?predicate
-        WHERE {
-            ?predicate rdf:type owl:ObjectProperty .
-        }
-        ORDER BY ?predicate
-        """
-        
-        results = self.ontology.query(query)
-        predicates = []
-        
-        for row in results:
-            predicate_uri = str(row['predicate'])
-            predicate_name = predicate_uri.split('#')[-1]
-            predicates.append(predicate_name)
-            
-        self.predicate_combo['values'] = sorted(predicates)
+        graph = self.ontology.graph
+        self.predicate_combo['values'] = sorted(
+            {_shorten(p) for p in graph.subjects(RDF.type, OWL.ObjectProperty)})
         
     def on_predicate_selected(self, event=None):
         """Update object suggestions based on predicate"""
@@ -348,36 +425,23 @@ class AddRelationshipDialog(BaseDialog):
             return
             
         # Get range of predicate
-        query = f"""
-        SELECT ?range
-        WHERE {{
-            univ:{predicate} rdfs:range ?range .
-        }}
-        """
-        
         try:
-            results = self.ontology.query(query)
-            if results:
-                range_class = str(list(results)[0]['range']).split('#')[-1]
-                
-                # Filter objects by class
-                query2 = f"""
-                SELECT ?instance
-                WHERE {{
-                    ?instance rdf:type univ:{range_class} .
-                    ?instance rdf:type owl:NamedIndividual .
-                }}
-                """
+            results = self.ontology.cached_query(
+                _Q_PREDICATE_RANGE,
+                initBindings={'predicate': self.ontology.univ_ns[predicate]})
+            row = next(iter(results), None)
+            if row is None:
+                return
+            # Datatype ranges have no individuals to suggest
+            range_uri = row['range']
+            if range_uri.startswith(XSD) or range_uri == RDFS.Literal:
+                return
                 
-                results2 = self.ontology.query(query2)
-                objects = []
-                
-                for row in results2:
-                    instance_uri = str(row['instance'])
-                    instance_id = instance_uri.split('#')[-1]
-                    objects.append(instance_id)
-                    
-                self.object_combo['values'] = sorted(objects)
+            # Filter objects by class
+            results2 = self.ontology.cached_query(
+                _Q_INSTANCES_OF, initBindings={'range': range_uri})
+            self._set_choices(self.object_combo,
+                              sorted(_shorten(row['instance']) for row in results2))
         except:
             pass
             
@@ -403,14 +467,68 @@ class AddRelationshipDialog(BaseDialog):
         except Exception as e:
             messagebox.showerror("Error", f"Failed to add relationship: {str(e)}")
 
+class AddClassDialog(BaseDialog):
+    """Dialog collecting a new class name and description"""
+    
+    def __init__(self, parent):
+        super().__init__(parent, "Add Class", 400, 180)
+        self.create_widgets()
+        
+    def create_widgets(self):
+        """Create dialog widgets"""
+        main_frame = ttk.Frame(self.dialog, padding=20)
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        
+        # Class name
+        ttk.Label(main_frame, text="Class Name:").grid(row=0, column=0, sticky=tk.W, pady=5)
+        self.name_var = tk.StringVar()
+        name_entry = ttk.Entry(main_frame, textvariable=self.name_var, width=30)
+        name_entry.grid(row=0, column=1, sticky=tk.W, pady=5, padx=(10, 0))
+        name_entry.focus_set()
+        
+        # Description
+        ttk.Label(main_frame, text="Description:").grid(row=1, column=0, sticky=tk.W, pady=5)
+        self.description_var = tk.StringVar()
+        ttk.Entry(main_frame, textvariable=self.description_var,
+                 width=30).grid(row=1, column=1, sticky=tk.W, pady=5, padx=(10, 0))
+        
+        # Buttons
+        button_frame = ttk.Frame(main_frame)
+        button_frame.grid(row=2, column=0, columnspan=2, pady=(20, 0))
+        
+        ttk.Button(button_frame, text="OK", command=self.on_ok,
+                  style='Primary.TButton').pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Cancel", command=self.dialog.destroy).pack(side=tk.LEFT, padx=5)
+        
+        self.dialog.bind('<Return>', lambda e: self.on_ok())
+        
+    def on_ok(self):
+        """Handle OK button click"""
+        name = self.name_var.get().strip()
+        if not name:
+            messagebox.showerror("Error", "Please enter a class name")
+            return
+            
+        self.result = {'name': name, 'description': self.description_var.get().strip()}
+        self.dialog.destroy()
+
 class SPARQLEditorDialog(BaseDialog):
     """Dialog for SPARQL query editing and execution"""
     
+    RESULT_CHUNK = 200  # table rows inserted per event-loop turn
+    
     def __init__(self, parent, query_engine, initial_query=""):
         # set attributes before creating widgets
         self.query_engine = query_engine
         self.initial_query = initial_query
         self.history = []
+        # Templates and their listbox labels are built once per dialog
+        self._templates = query_engine.get_common_queries()
+        self._template_names = list(self._templates)
+        self._template_displays = [' '.join(word.capitalize() for word in name.split('_'))
+                                   for name in self._template_names]
+        self._query_id = 0
+        self._cancel = threading.Event()
         super().__init__(parent, "SPARQL Query Editor", 800, 600)
         self.create_widgets()
         
@@ -427,15 +545,14 @@ class SPARQLEditorDialog(BaseDialog):
         text_frame = ttk.Frame(input_frame)
         text_frame.pack(fill=tk.BOTH, expand=True)
         
-        # Line numbers
-        self.line_numbers = tk.Text(text_frame, width=4, padx=5, pady=5,
-                                   state='disabled', font=('Courier', 10))
+        # Line numbers, drawn on a canvas for the visible lines only
+        self.line_numbers = tk.Canvas(text_frame, width=40, highlightthickness=0)
         self.line_numbers.pack(side=tk.LEFT, fill=tk.Y)
         
         # Query text
         self.query_text = tk.Text(text_frame, wrap=tk.NONE, font=('Courier', 10),
                                  padx=5, pady=5)
-        query_scroll_y = ttk.Scrollbar(text_frame, command=self.on_text_scroll)
+        self.query_scroll_y = ttk.Scrollbar(text_frame, command=self.query_text.yview)
         query_scroll_x = ttk.Scrollbar(input_frame, orient=tk.HORIZONTAL,
                                       command=self.query_text.xview)
         
@@ -443,7 +560,7 @@ class SPARQLEditorDialog(BaseDialog):
                               xscrollcommand=query_scroll_x.set)
         
         self.query_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        query_scroll_y.pack(side=tk.LEFT, fill=tk.Y)
+        self.query_scroll_y.pack(side=tk.LEFT, fill=tk.Y)
         query_scroll_x.pack(fill=tk.X)
         
         # Set initial query
@@ -451,18 +568,21 @@ class SPARQLEditorDialog(BaseDialog):
             self.query_text.insert(1.0, self.initial_query)
             self.update_line_numbers()
             
-        # Bind events
-        self.query_text.bind('<KeyRelease>', self.on_query_change)
+        # Bind events; scrolling redraws through on_text_scroll
+        self.query_text.bind('<<Modified>>', self.on_query_change)
+        self.query_text.bind('<Configure>', lambda e: self.update_line_numbers())
         
         # Result frame
         result_frame = ttk.LabelFrame(main_frame, text="Results", padding=10)
         result_frame.pack(fill=tk.BOTH, expand=True, pady=(10, 0))
         
-        # Result text
-        self.result_text = tk.Text(result_frame, wrap=tk.NONE, font=('Courier', 9),
+        # Result text for JSON/CSV/graph output
+        self.text_container = ttk.Frame(result_frame)
+        self.text_container.pack(fill=tk.BOTH, expand=True)
+        self.result_text = tk.Text(self.text_container, wrap=tk.NONE, font=('Courier', 9),
                                   padx=5, pady=5)
-        result_scroll_y = ttk.Scrollbar(result_frame, command=self.result_text.yview)
-        result_scroll_x = ttk.Scrollbar(result_frame, orient=tk.HORIZONTAL,
+        result_scroll_y = ttk.Scrollbar(self.text_container, command=self.result_text.yview)
+        result_scroll_x = ttk.Scrollbar(self.text_container, orient=tk.HORIZONTAL,
                                        command=self.result_text.xview)
         
         self.result_text.config(yscrollcommand=result_scroll_y.set,
@@ -472,6 +592,22 @@ class SPARQLEditorDialog(BaseDialog):
         result_scroll_y.pack(side=tk.LEFT, fill=tk.Y)
         result_scroll_x.pack(side=tk.BOTTOM, fill=tk.X)
         
+        # Result tree for table output; Treeview only renders visible rows
+        self.tree_container = ttk.Frame(result_frame)
+        self.result_tree = ttk.Treeview(self.tree_container, show='headings')
+        tree_scroll_y = ttk.Scrollbar(self.tree_container, command=self.result_tree.yview)
+        tree_scroll_x = ttk.Scrollbar(self.tree_container, orient=tk.HORIZONTAL,
+                                     command=self.result_tree.xview)
+        
+        self.result_tree.config(yscrollcommand=tree_scroll_y.set,
+                               xscrollcommand=tree_scroll_x.set)
+        
+        tree_scroll_x.pack(side=tk.BOTTOM, fill=tk.X)
+        self.result_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        tree_scroll_y.pack(side=tk.LEFT, fill=tk.Y)
+        self._table_rows = None  # (headers, rows) shown in the tree
+        self._last_result = None  # last SELECT result, exported on save
+        
         # Control frame
         control_frame = ttk.Frame(main_frame)
         control_frame.pack(fill=tk.X, pady=(10, 0))
@@ -502,6 +638,9 @@ class SPARQLEditorDialog(BaseDialog):
         ttk.Button(button_frame, text="Execute (Ctrl+Enter)",
                   command=self.execute_query,
                   style='Primary.TButton').pack(side=tk.LEFT, padx=2)
+        self.cancel_button = ttk.Button(button_frame, text="Cancel",
+                                        command=self.cancel_query, state=tk.DISABLED)
+        self.cancel_button.pack(side=tk.LEFT, padx=2)
         ttk.Button(button_frame, text="Clear",
                   command=self.clear_results).pack(side=tk.LEFT, padx=2)
         ttk.Button(button_frame, text="Save Results",
@@ -512,25 +651,34 @@ class SPARQLEditorDialog(BaseDialog):
         # Bind Ctrl+Enter
         self.query_text.bind('<Control-Return>', lambda e: self.execute_query())
         
-    def on_text_scroll(self, *args):
-        """Sync scroll between text and line numbers"""
-        self.line_numbers.yview_moveto(args[0])
-        self.query_text.yview_moveto(args[0])
+    def on_text_scroll(self, first, last):
+        """Move the scrollbar and redraw line numbers when the text view moves"""
+        self.query_scroll_y.set(first, last)
+        self.update_line_numbers()
         
     def on_query_change(self, event=None):
         """Update line numbers when query changes"""
         self.update_line_numbers()
+        # Re-arm <<Modified>>, which only fires on the unmodified -> modified edge
+        self.query_text.edit_modified(False)
         
     def update_line_numbers(self):
-        """Update line numbers in the side panel"""
-        self.line_numbers.config(state='normal')
-        self.line_numbers.delete(1.0, tk.END)
-        
-        lines = self.query_text.get(1.0, tk.END).count('\n')
-        for i in range(1, lines + 1):
-            self.line_numbers.insert(tk.END, f"{i}\n")
-            
-        self.line_numbers.config(state='disabled')
+        """Draw line numbers for the lines currently visible in the query text"""
+        gutter = self.line_numbers
+        text = self.query_text
+        gutter.delete("all")
+        
+        index = text.index("@0,0")
+        while True:
+            dline = text.dlineinfo(index)
+            if dline is None:
+                break
+            gutter.create_text(36, dline[1], anchor=tk.NE, font=('Courier', 10),
+                               text=index.split('.')[0])
+            next_index = text.index(f"{index}+1line")
+            if next_index == index:
+                break
+            index = next_index
         
     def execute_query(self):
         """Execute SPARQL query"""
@@ -541,110 +689,168 @@ class SPARQLEditorDialog(BaseDialog):
             return
             
         try:
-            # Add to history
-            self.history.append(query)
-            
-            # Execute query
             limit = int(self.limit_var.get())
+        except ValueError:
+            messagebox.showerror("Query Error", "Limit must be a whole number")
+            return
+            
+        # Add to history
+        self.history.append(query)
+        
+        # Execute on a worker thread so the dialog stays responsive; each run
+        # gets its own cancel event so a stale run can't be revived
+        self._cancel.set()
+        self._cancel = threading.Event()
+        self._query_id += 1
+        self.cancel_button.config(state=tk.NORMAL)
+        threading.Thread(target=self._query_worker,
+                         args=(self._query_id, query, limit, self._cancel),
+                         daemon=True).start()
+        
+    def _query_worker(self, query_id, query, limit, cancel):
+        """Run the query off the main thread"""
+        try:
             result = self.query_engine.execute_query(query, limit=limit)
+        except Exception as e:
+            self.dialog.after(0, self._query_failed, query_id, e)
+            return
             
-            # Display results
-            self.display_results(result)
+        # Enforce the limit spinner even when the query has its own LIMIT;
+        # copy so the engine's cached result is left whole
+        if result.type == 'SELECT' and len(result) > limit:
+            result = copy.copy(result)
+            del result[limit:]
+        self.dialog.after(0, self._query_done, query_id, result, cancel)
+        
+    def _query_done(self, query_id, result, cancel):
+        """Display the rows of the latest run unless it was cancelled"""
+        if query_id != self._query_id or cancel.is_set():
+            return
+        self.display_results(result, cancel)
+        
+    def _query_failed(self, query_id, error):
+        """Report an error from the latest run"""
+        if query_id != self._query_id or self._cancel.is_set():
+            return
+        self.cancel_button.config(state=tk.DISABLED)
+        messagebox.showerror("Query Error", f"Error executing query: {str(error)}")
+        
+    def cancel_query(self):
+        """Drop the running query and stop filling in its rows"""
+        self._cancel.set()
+        self.cancel_button.config(state=tk.DISABLED)
+        
+
+    def _show_result_widget(self, table):
+        """Show either the result tree (table) or the result text"""
+        if table:
+            self.text_container.pack_forget()
+            self.tree_container.pack(fill=tk.BOTH, expand=True)
+        else:
+            self.tree_container.pack_forget()
+            self.text_container.pack(fill=tk.BOTH, expand=True)
             
-        except Exception as e:
-            messagebox.showerror("Query Error", f"Error executing query: {str(e)}")
+    def _iter_simplified_rows(self, result, headers, simplify=True):
+        """Yield each result row once as a tuple of strings"""
+        for row in result:
+            row_data = []
+            for var in headers:
+                value = row[var]
+                if not value:
+                    row_data.append("")
+                elif simplify:
+                    row_data.append(_shorten(value))
+                else:
+                    row_data.append(str(value))
+            yield tuple(row_data)
             
-    def display_results(self, result):
+    def _stream_rows(self, rows, table_rows, cancel):
+        """Insert result rows into the tree a chunk at a time"""
+        if cancel.is_set():
+            return
+        tree = self.result_tree
+        count = 0
+        for row_data in islice(rows, self.RESULT_CHUNK):
+            tree.insert('', tk.END, values=row_data)
+            table_rows.append(row_data)
+            count += 1
+        if count == self.RESULT_CHUNK:
+            # Possibly more to come; let Tk handle events before the next chunk
+            self.dialog.after(1, self._stream_rows, rows, table_rows, cancel)
+        else:
+            self.cancel_button.config(state=tk.DISABLED)
+            
+    def display_results(self, result, cancel=None):
         """Display query results"""
+        cancel = cancel or self._cancel
         self.result_text.delete(1.0, tk.END)
+        self.result_tree.delete(*self.result_tree.get_children())
+        self._table_rows = None
+        self._last_result = result if result.type == 'SELECT' else None
+        table = result.type == 'SELECT' and self.format_var.get() == "Table"
+        self._show_result_widget(table)
         
         if result.type == 'SELECT':
             # Get headers
             headers = result.vars
             
-            # Create table
-            table_data = []
-            
-            # Add headers
-            table_data.append([str(h) for h in headers])
-            table_data.append(['-' * 20 for _ in headers])
-            
-            # Add rows
-            for row in result:
-                row_data = []
-                for var in headers:
-                    value = row[var]
-                    if value:
-                        # Simplify URIs
-                        value_str = str(value)
-                        if '#' in value_str:
-                            value_str = value_str.split('#')[-1]
-                        elif '/' in value_str:
-                            value_str = value_str.split('/')[-1]
-                        row_data.append(value_str)
-                    else:
-                        row_data.append("")
-                table_data.append(row_data)
-                
             # Format as table
-            if self.format_var.get() == "Table":
-                # Calculate column widths
-                col_widths = [max(len(str(row[i])) for row in table_data) 
-                            for i in range(len(headers))]
-                
-                # Format rows
-                for row in table_data:
-                    formatted_row = []
-                    for i, cell in enumerate(row):
-                        formatted_row.append(str(cell).ljust(col_widths[i] + 2))
-                    self.result_text.insert(tk.END, ' '.join(formatted_row) + '\n')
+            if table:
+                columns = tuple(str(h) for h in headers)
+                tree = self.result_tree
+                tree['columns'] = columns
+                for column in columns:
+                    tree.heading(column, text=column, anchor=tk.W)
+                    tree.column(column, width=150, stretch=True)
                     
+                # Rows are streamed in so large results don't stall the dialog
+                rows = []
+                self._table_rows = (columns, rows)
+                self._stream_rows(self._iter_simplified_rows(result, headers), rows, cancel)
+                return
+                
             elif self.format_var.get() == "JSON":
-                import json
-                data = []
-                for row in result:
-                    row_dict = {}
-                    for var in headers:
-                        value = row[var]
-                        if value:
-                            row_dict[str(var)] = str(value)
-                    data.append(row_dict)
-                self.result_text.insert(tk.END, json.dumps(data, indent=2))
+                self.result_text.insert(tk.END, json.dumps(self._result_records(result),
+                                                           indent=2))
                 
             elif self.format_var.get() == "CSV":
-                import csv
-                import io
-                
                 output = io.StringIO()
-                writer = csv.writer(output)
-                
-                # Write headers
-                writer.writerow([str(h) for h in headers])
-                
-                # Write rows
-                for row in result:
-                    row_data = []
-                    for var in headers:
-                        value = row[var]
-                        row_data.append(str(value) if value else "")
-                    writer.writerow(row_data)
-                    
+                self._write_csv(output, result)
                 self.result_text.insert(tk.END, output.getvalue())
                 
         elif result.type == 'ASK':
             self.result_text.insert(tk.END, f"Result: {result.askAnswer}\n")
             
         elif result.type == 'CONSTRUCT' or result.type == 'DESCRIBE':
-            self.result_text.insert(tk.END, "Graph result:\n")
-            for triple in result:
-                self.result_text.insert(tk.END, f"{triple}\n")
+            self.result_text.insert(tk.END, "Graph result:\n" +
+                                    "".join(f"{triple}\n" for triple in result))
+                
+        self.cancel_button.config(state=tk.DISABLED)
                 
     def clear_results(self):
         """Clear results text"""
+        self.cancel_query()
         self.result_text.delete(1.0, tk.END)
+        self.result_tree.delete(*self.result_tree.get_children())
+        self._table_rows = None
+        self._last_result = None
+        
+    def _result_records(self, result):
+        """SELECT rows as dicts of bound variables with full values"""
+        names = [str(var) for var in result.vars]
+        return [{name: value for name, value in zip(names, row_data) if value}
+                for row_data in self._iter_simplified_rows(result, result.vars,
+                                                           simplify=False)]
+        
+    def _write_csv(self, f, result):
+        """Write SELECT rows with full values as CSV"""
+        writer = csv.writer(f)
+        writer.writerow([str(h) for h in result.vars])
+        writer.writerows(self._iter_simplified_rows(result, result.vars, simplify=False))
         
     def save_results(self):
         """Save results to file"""
+        from tkinter import filedialog
         filename = filedialog.asksaveasfilename(
             defaultextension=".txt",
             filetypes=[
@@ -656,16 +862,37 @@ class SPARQLEditorDialog(BaseDialog):
         )
         
         if filename:
+            # JSON and CSV are written straight from the last result rather
+            # than copied out of the result widgets
+            ext = os.path.splitext(filename)[1].lower()
+            result = self._last_result
             try:
-                with open(filename, 'w', encoding='utf-8') as f:
-                    f.write(self.result_text.get(1.0, tk.END))
+                with open(filename, 'w', encoding='utf-8',
+                          newline='' if ext == '.csv' else None) as f:
+                    if result is not None and ext == '.json':
+                        json.dump(self._result_records(result), f, indent=2)
+                    elif result is not None and ext == '.csv':
+                        self._write_csv(f, result)
+                    elif self._table_rows:
+                        f.write(self._format_table(*self._table_rows))
+                    else:
+                        f.write(self.result_text.get(1.0, tk.END))
                 messagebox.showinfo("Success", f"Results saved to {filename}")
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to save: {str(e)}")
                 
+    def _format_table(self, headers, rows):
+        """Format table rows as padded plain text"""
+        table_data = [list(headers), ['-' * 20 for _ in headers]] + rows
+        col_widths = [max(len(row[i]) for row in table_data)
+                      for i in range(len(headers))]
+        return ''.join(
+            ' '.join(cell.ljust(col_widths[i] + 2) for i, cell in enumerate(row)) + '\n'
+            for row in table_data)
+        
     def show_templates(self):
         """Show query templates"""
-        templates = self.query_engine.get_common_queries()
+        templates = self._templates
         
         template_window = tk.Toplevel(self.dialog)
         template_window.title("Query Templates")
@@ -684,9 +911,7 @@ class SPARQLEditorDialog(BaseDialog):
         scrollbar = ttk.Scrollbar(template_window, command=listbox.yview)
         listbox.config(yscrollcommand=scrollbar.set)
         
-        for name in templates.keys():
-            display_name = ' '.join(word.capitalize() for word in name.split('_'))
-            listbox.insert(tk.END, display_name)
+        listbox.insert(tk.END, *self._template_displays)
             
         listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
@@ -694,7 +919,7 @@ class SPARQLEditorDialog(BaseDialog):
         def on_template_select(event):
             selection = listbox.curselection()
             if selection:
-                template_name = list(templates.keys())[selection[0]]
+                template_name = self._template_names[selection[0]]
                 self.query_text.delete(1.0, tk.END)
                 self.query_text.insert(1.0, templates[template_name])
                 self.update_line_numbers()
@@ -710,6 +935,8 @@ class SearchDialog(BaseDialog):
     def __init__(self, parent, ontology):
         self.ontology = ontology
         super().__init__(parent, "Search", 600, 400)
+        self._search_after_id = None
+        self._search_id = 0
         self.create_widgets()
 
     def create_widgets(self):
@@ -721,6 +948,7 @@ class SearchDialog(BaseDialog):
         entry = ttk.Entry(main_frame, textvariable=self.query_var, width=60)
         entry.pack(fill=tk.X, pady=(5,10))
         entry.bind('<Return>', lambda e: self.perform_search())
+        self.query_var.trace_add('write', lambda *args: self._schedule_search())
 
         self.results_lb = tk.Listbox(main_frame, height=12)
         self.results_lb.pack(fill=tk.BOTH, expand=True)
@@ -731,30 +959,54 @@ class SearchDialog(BaseDialog):
         ttk.Button(btn_frame, text="Search", command=self.perform_search).pack(side=tk.LEFT)
         ttk.Button(btn_frame, text="Close", command=self.dialog.destroy).pack(side=tk.RIGHT)
 
+    def _schedule_search(self):
+        """Debounce search-as-you-type"""
+        if self._search_after_id is not None:
+            self.dialog.after_cancel(self._search_after_id)
+        self._search_after_id = self.dialog.after(250, self.perform_search)
+
     def perform_search(self):
+        if self._search_after_id is not None:
+            self.dialog.after_cancel(self._search_after_id)
+            self._search_after_id = None
         q = self.query_var.get().strip().lower()
         if not q:
             return
 
-        # Search by instance URI or name literal
-        sparql = f"""
-        SELECT ?instance ?name WHERE {{
-            ?instance rdf:type owl:NamedIndividual .
-            OPTIONAL {{ ?instance univ:name ?name }} .
-            FILTER (CONTAINS(LCASE(STR(?instance)), "{q}") || (BOUND(?name) && CONTAINS(LCASE(STR(?name)), "{q}")))
-        }} ORDER BY ?instance LIMIT 200
-        """
+        # Query on a worker thread so typing stays responsive; results of
+        # superseded searches are dropped in _populate_results
+        self._search_id += 1
+        threading.Thread(target=self._search_worker, args=(self._search_id, q),
+                         daemon=True).start()
 
+    def _search_worker(self, search_id, q):
+        """Search by instance URI or name literal off the main thread"""
+        graph = self.ontology.graph
+        name_prop = self.ontology.univ_ns['name']
+        items = []
         try:
-            results = list(self.ontology.query(sparql))
-            self.results_lb.delete(0, tk.END)
-            for row in results:
-                inst = str(row['instance']).split('#')[-1]
-                name = str(row['name']) if row.get('name') else ''
-                display = f"{inst} - {name}" if name else inst
-                self.results_lb.insert(tk.END, display)
+            for instance in sorted(set(graph.subjects(RDF.type, OWL.NamedIndividual))):
+                names = [str(name) for name in graph.objects(instance, name_prop)] or ['']
+                inst = _shorten(instance)
+                for name in names:
+                    if q in instance.lower() or q in name.lower():
+                        items.append(f"{inst} - {name}" if name else inst)
+                if len(items) >= 200:
+                    del items[200:]
+                    break
         except Exception as e:
-            messagebox.showerror("Search Error", f"Failed to search: {e}")
+            self.dialog.after(0, messagebox.showerror, "Search Error", f"Failed to search: {e}")
+            return
+
+        self.dialog.after(0, self._populate_results, search_id, items)
+
+    def _populate_results(self, search_id, items):
+        """Show results from the latest search"""
+        if search_id != self._search_id:
+            return
+        self.results_lb.delete(0, tk.END)
+        if items:
+            self.results_lb.insert(tk.END, *items)
 
     def select_result(self):
         sel = self.results_lb.curselection()
@@ -765,12 +1017,24 @@ class SearchDialog(BaseDialog):
         self.result = inst_id
         self.dialog.destroy()
 
+def _run_in_background(widget, work, on_success, on_error):
+    """Run work() on a worker thread and report back on the Tk thread"""
+    def worker():
+        try:
+            result = work()
+        except Exception as e:
+            widget.after(0, on_error, e)
+        else:
+            widget.after(0, on_success, result)
+    threading.Thread(target=worker, daemon=True).start()
+
 class SaveOntologyDialog:
     """Dialog for saving ontology"""
     
-    def __init__(self, parent, ontology, save_as=False):
+    def __init__(self, parent, ontology, save_as=False, on_saved=None):
         self.parent = parent
         self.ontology = ontology
+        self.on_saved = on_saved
         
         if save_as or not hasattr(self, 'last_filename'):
             self.save_as()
@@ -779,17 +1043,14 @@ class SaveOntologyDialog:
             
     def save(self):
         """Save ontology to last used filename"""
-        try:
-            if hasattr(self, 'last_filename') and self.last_filename:
-                self.ontology.save_ontology(self.last_filename)
-                messagebox.showinfo("Success", f"Ontology saved to {self.last_filename}")
-            else:
-                self.save_as()
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to save: {str(e)}")
+        if hasattr(self, 'last_filename') and self.last_filename:
+            self._save_async(self.last_filename, 'turtle')
+        else:
+            self.save_as()
             
     def save_as(self):
         """Save ontology with new filename"""
+        from tkinter import filedialog
         filename = filedialog.asksaveasfilename(
             defaultextension=".ttl",
             filetypes=[
@@ -803,35 +1064,40 @@ class SaveOntologyDialog:
         )
         
         if filename:
-            try:
-                # Determine format from extension
-                if filename.endswith('.ttl'):
-                    format = 'turtle'
-                elif filename.endswith('.rdf') or filename.endswith('.xml'):
-                    format = 'xml'
-                elif filename.endswith('.jsonld'):
-                    format = 'json-ld'
-                elif filename.endswith('.nt'):
-                    format = 'nt'
-                else:
-                    format = 'turtle'
-                    
-                self.ontology.save_ontology(filename, format)
-                self.last_filename = filename
-                messagebox.showinfo("Success", f"Ontology saved to {filename}")
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to save: {str(e)}")
+            # Determine format from extension; unknown extensions get
+            # N-Triples, the fastest writer
+            ext = os.path.splitext(filename)[1].lower()
+            format = FORMAT_BY_EXTENSION.get(ext, 'nt')
+                
+            self._save_async(filename, format)
+            
+    def _save_async(self, filename, format):
+        """Serialize on a worker thread so the GUI stays responsive"""
+        def on_success(_):
+            self.last_filename = filename
+            if self.on_saved:
+                self.on_saved(filename)
+            messagebox.showinfo("Success", f"Ontology saved to {filename}")
+            
+        def on_error(e):
+            messagebox.showerror("Error", f"Failed to save: {str(e)}")
+            
+        _run_in_background(self.parent,
+                           lambda: self.ontology.save_ontology(filename, format),
+                           on_success, on_error)
 
 class LoadOntologyDialog:
     """Dialog for loading ontology"""
     
-    def __init__(self, parent, ontology):
+    def __init__(self, parent, ontology, on_loaded=None):
         self.parent = parent
         self.ontology = ontology
+        self.on_loaded = on_loaded
         self.load()
         
     def load(self):
         """Load ontology from file"""
+        from tkinter import filedialog
         filename = filedialog.askopenfilename(
             filetypes=[
                 ("Turtle files", "*.ttl"),
@@ -843,14 +1109,21 @@ class LoadOntologyDialog:
             title="Load Ontology"
         )
         
-        if filename:
-            try:
-                self.ontology.load_ontology(filename)
-                return True
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to load: {str(e)}")
-                return False
-        return False
+        if not filename:
+            return False
+            
+        # Parse on a worker thread; on_loaded runs on the Tk thread once done
+        def on_success(_):
+            if self.on_loaded:
+                self.on_loaded(filename)
+                
+        def on_error(e):
+            messagebox.showerror("Error", f"Failed to load: {str(e)}")
+            
+        _run_in_background(self.parent,
+                           lambda: self.ontology.load_ontology(filename),
+                           on_success, on_error)
+        return True
 
 class StatisticsDialog(BaseDialog):
     """Dialog for displaying ontology statistics"""
@@ -866,31 +1139,26 @@ class StatisticsDialog(BaseDialog):
         main_frame = ttk.Frame(self.dialog, padding=20)
         main_frame.pack(fill=tk.BOTH, expand=True)
         
-        # Get statistics
+        # Get statistics and derive the per-class figures once for all tabs
         stats = self.ontology.get_statistics()
         hierarchy = self.ontology.get_class_hierarchy()
+        self._classes_by_count = sorted(
+            ((name, info['instance_count']) for name, info in hierarchy.items()),
+            key=itemgetter(1), reverse=True)
+        self._total_instances = sum(count for _, count in self._classes_by_count)
+        self._sorted_classes = sorted(hierarchy.items())
         
         # Create notebook for tabs
         notebook = ttk.Notebook(main_frame)
         notebook.pack(fill=tk.BOTH, expand=True)
         
-        # Overview tab
-        overview_frame = ttk.Frame(notebook)
-        notebook.add(overview_frame, text="Overview")
-        
-        self.create_overview_tab(overview_frame, stats)
-        
-        # Class distribution tab
-        distribution_frame = ttk.Frame(notebook)
-        notebook.add(distribution_frame, text="Class Distribution")
-        
-        self.create_distribution_tab(distribution_frame, hierarchy)
-        
-        # Details tab
-        details_frame = ttk.Frame(notebook)
-        notebook.add(details_frame, text="Details")
-        
-        self.create_details_tab(details_frame, hierarchy)
+        # Tabs are filled in on first selection
+        self.add_lazy_tab(notebook, "Overview",
+                          lambda frame: self.create_overview_tab(frame, stats))
+        self.add_lazy_tab(notebook, "Class Distribution", self.create_distribution_tab)
+        self.add_lazy_tab(notebook, "Details", self.create_details_tab)
+        notebook.bind('<<NotebookTabChanged>>', self.build_selected_tab)
+        self.build_selected_tab(notebook=notebook)
         
         # Close button
         ttk.Button(main_frame, text="Close",
@@ -905,31 +1173,29 @@ class StatisticsDialog(BaseDialog):
         text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
-        text.insert(tk.END, "ONTOLOGY STATISTICS\n")
-        text.insert(tk.END, "=" * 40 + "\n\n")
-        
-        text.insert(tk.END, f"Classes: {stats['classes']}\n")
-        text.insert(tk.END, f"Instances: {stats['instances']}\n")
-        text.insert(tk.END, f"Object Properties: {stats['object_properties']}\n")
-        text.insert(tk.END, f"Data Properties: {stats['data_properties']}\n")
-        text.insert(tk.END, f"Relationships: {stats['relationships']}\n\n")
+        # Build the whole report first and hand it to Tk in one insert
+        parts = [
+            "ONTOLOGY STATISTICS\n",
+            "=" * 40 + "\n\n",
+            f"Classes: {stats['classes']}\n",
+            f"Instances: {stats['instances']}\n",
+            f"Object Properties: {stats['object_properties']}\n",
+            f"Data Properties: {stats['data_properties']}\n",
+            f"Relationships: {stats['relationships']}\n\n",
+        ]
         
         # Calculate density
         if stats['instances'] > 0:
             density = stats['relationships'] / stats['instances']
-            text.insert(tk.END, f"Relationship Density: {density:.2f} relationships per instance\n")
+            parts.append(f"Relationship Density: {density:.2f} relationships per instance\n")
             
+        text.insert(1.0, "".join(parts))
         text.config(state=tk.DISABLED)
         
-    def create_distribution_tab(self, parent, hierarchy):
+    def create_distribution_tab(self, parent):
         """Create class distribution tab"""
-        # Calculate instance counts
-        class_counts = {}
-        for class_name, info in hierarchy.items():
-            class_counts[class_name] = info['instance_count']
-            
-        # Sort by count
-        sorted_classes = sorted(class_counts.items(), key=lambda x: x[1], reverse=True)
+        # Sorted by count in create_widgets
+        sorted_classes = self._classes_by_count
         
         # Create treeview
         tree = ttk.Treeview(parent, columns=('Count', 'Percentage'), show='headings')
@@ -944,22 +1210,20 @@ class StatisticsDialog(BaseDialog):
         tree.column('Count', width=100)
         tree.column('Percentage', width=100)
         
-        total_instances = sum(class_counts.values())
+        # Percentages for every class in one vectorized step; with no
+        # instances all counts are zero, so every class shows 0.0%
+        counts = np.fromiter((count for _, count in sorted_classes), dtype=np.int64,
+                             count=len(sorted_classes))
+        percentages = counts * (100.0 / max(self._total_instances, 1))
         
-        for class_name, count in sorted_classes:
-            if total_instances > 0:
-                percentage = (count / total_instances) * 100
-                percentage_str = f"{percentage:.1f}%"
-            else:
-                percentage_str = "0.0%"
-                
+        for (class_name, count), percentage in zip(sorted_classes, percentages.tolist()):
             tree.insert('', tk.END, text=class_name,
-                       values=(count, percentage_str))
+                       values=(count, f"{percentage:.1f}%"))
                        
         tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
-    def create_details_tab(self, parent, hierarchy):
+    def create_details_tab(self, parent):
         """Create details tab"""
         text = tk.Text(parent, wrap=tk.WORD, font=('Arial', 10))
         scrollbar = ttk.Scrollbar(parent, command=text.yview)
@@ -968,77 +1232,30 @@ class StatisticsDialog(BaseDialog):
         text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
-        text.insert(tk.END, "CLASS DETAILS\n")
-        text.insert(tk.END, "=" * 40 + "\n\n")
+        # Build the whole report first and hand it to Tk in one insert
+        parts = ["CLASS DETAILS\n", "=" * 40 + "\n\n"]
+        append = parts.append
         
-        for class_name, info in sorted(hierarchy.items()):
-            text.insert(tk.END, f"{info['label']}:\n")
-            text.insert(tk.END, f"  Instances: {info['instance_count']}\n")
+        for class_name, info in self._sorted_classes:
+            append(f"{info['label']}:\n")
+            append(f"  Instances: {info['instance_count']}\n")
             
             if info['subclasses']:
-                text.insert(tk.END, f"  Subclasses ({len(info['subclasses'])}):\n")
+                append(f"  Subclasses ({len(info['subclasses'])}):\n")
                 for subclass in info['subclasses'][:5]:  # Show first 5
-                    text.insert(tk.END, f"    • {subclass}\n")
+                    append(f"    • {subclass}\n")
                 if len(info['subclasses']) > 5:
-                    text.insert(tk.END, f"    ... and {len(info['subclasses']) - 5} more\n")
+                    append(f"    ... and {len(info['subclasses']) - 5} more\n")
                     
             if info['comment']:
-                text.insert(tk.END, f"  Description: {info['comment']}\n")
+                append(f"  Description: {info['comment']}\n")
                 
-            text.insert(tk.END, "\n")
+            append("\n")
             
+        text.insert(1.0, "".join(parts))
         text.config(state=tk.DISABLED)
 
-class DocumentationDialog(BaseDialog):
-    """Dialog for displaying documentation"""
-    
-    def __init__(self, parent):
-        super().__init__(parent, "Documentation", 700, 500)
-        self.create_widgets()
-        
-    def create_widgets(self):
-        """Create dialog widgets"""
-        main_frame = ttk.Frame(self.dialog, padding=10)
-        main_frame.pack(fill=tk.BOTH, expand=True)
-        
-        # Create notebook for sections
-        notebook = ttk.Notebook(main_frame)
-        notebook.pack(fill=tk.BOTH, expand=True)
-        
-        # Quick Start tab
-        quickstart_frame = ttk.Frame(notebook)
-        notebook.add(quickstart_frame, text="Quick Start")
-        self.create_quickstart_tab(quickstart_frame)
-        
-        # Ontology tab
-        ontology_frame = ttk.Frame(notebook)
-        notebook.add(ontology_frame, text="Ontology")
-        self.create_ontology_tab(ontology_frame)
-        
-        # SPARQL tab
-        sparql_frame = ttk.Frame(notebook)
-        notebook.add(sparql_frame, text="SPARQL")
-        self.create_sparql_tab(sparql_frame)
-        
-        # Visualization tab
-        viz_frame = ttk.Frame(notebook)
-        notebook.add(viz_frame, text="Visualization")
-        self.create_visualization_tab(viz_frame)
-        
-        # Close button
-        ttk.Button(main_frame, text="Close",
-                  command=self.dialog.destroy).pack(pady=(10, 0))
-                  
-    def create_quickstart_tab(self, parent):
-        """Create quick start documentation"""
-        text = tk.Text(parent, wrap=tk.WORD, font=('Arial', 10))
-        scrollbar = ttk.Scrollbar(parent, command=text.yview)
-        text.config(yscrollcommand=scrollbar.set)
-        
-        text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        
-        content = """
+_QUICK_START_DOC = """
         QUICK START GUIDE
         =================
         
@@ -1084,20 +1301,8 @@ class DocumentationDialog(BaseDialog):
         - Create your own instances and relationships
         - Experiment with different visualizations
         """
-        
-        text.insert(1.0, content)
-        text.config(state=tk.DISABLED)
-        
-    def create_ontology_tab(self, parent):
-        """Create ontology documentation"""
-        text = tk.Text(parent, wrap=tk.WORD, font=('Arial', 10))
-        scrollbar = ttk.Scrollbar(parent, command=text.yview)
-        text.config(yscrollcommand=scrollbar.set)
-        
-        text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        
-        content = """
+
+_ONTOLOGY_DOC = """
         ONTOLOGY STRUCTURE
         ===================
         
@@ -1153,20 +1358,8 @@ class DocumentationDialog(BaseDialog):
         - Add descriptions where helpful
         - Validate relationships before adding
         """
-        
-        text.insert(1.0, content)
-        text.config(state=tk.DISABLED)
-        
-    def create_sparql_tab(self, parent):
-        """Create SPARQL documentation"""
-        text = tk.Text(parent, wrap=tk.WORD, font=('Courier', 10))
-        scrollbar = ttk.Scrollbar(parent, command=text.yview)
-        text.config(yscrollcommand=scrollbar.set)
-        
-        text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        
-        content = """
+
+_SPARQL_DOC = """
         SPARQL QUERY GUIDE
         ===================
         
@@ -1227,20 +1420,8 @@ class DocumentationDialog(BaseDialog):
         - ORDER BY for sorting
         - DISTINCT for unique results
         """
-        
-        text.insert(1.0, content)
-        text.config(state=tk.DISABLED)
-        
-    def create_visualization_tab(self, parent):
-        """Create visualization documentation"""
-        text = tk.Text(parent, wrap=tk.WORD, font=('Arial', 10))
-        scrollbar = ttk.Scrollbar(parent, command=text.yview)
-        text.config(yscrollcommand=scrollbar.set)
-        
-        text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        
-        content = """
+
+_VISUALIZATION_DOC = """
         VISUALIZATION GUIDE
         ===================
         
@@ -1309,6 +1490,50 @@ class DocumentationDialog(BaseDialog):
         - Choose background color
         - Include legends
         """
+
+# Documentation tab titles and their text, built on first view
+DOC_SECTIONS = {
+    "Quick Start": _QUICK_START_DOC,
+    "Ontology": _ONTOLOGY_DOC,
+    "SPARQL": _SPARQL_DOC,
+    "Visualization": _VISUALIZATION_DOC,
+}
+
+class DocumentationDialog(BaseDialog):
+    """Dialog for displaying documentation"""
+    
+    def __init__(self, parent):
+        super().__init__(parent, "Documentation", 700, 500)
+        self.create_widgets()
+        
+    def create_widgets(self):
+        """Create dialog widgets"""
+        main_frame = ttk.Frame(self.dialog, padding=10)
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        
+        # Create notebook for sections
+        notebook = ttk.Notebook(main_frame)
+        notebook.pack(fill=tk.BOTH, expand=True)
+        
+        # Tabs are filled in on first selection
+        for title, content in DOC_SECTIONS.items():
+            self.add_lazy_tab(notebook, title,
+                              partial(self.create_doc_tab, content=content))
+        notebook.bind('<<NotebookTabChanged>>', self.build_selected_tab)
+        self.build_selected_tab(notebook=notebook)
+        
+        # Close button
+        ttk.Button(main_frame, text="Close",
+                  command=self.dialog.destroy).pack(pady=(10, 0))
+                  
+    def create_doc_tab(self, parent, content):
+        """Create a documentation tab showing content"""
+        text = tk.Text(parent, wrap=tk.WORD, font=('Arial', 10))
+        scrollbar = ttk.Scrollbar(parent, command=text.yview)
+        text.config(yscrollcommand=scrollbar.set)
+        
+        text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
         text.insert(1.0, content)
         text.config(state=tk.DISABLED)
@@ -1373,6 +1598,7 @@ class QueryHistoryDialog(BaseDialog):
     def __init__(self, parent, query_engine):
         super().__init__(parent, "Query History", 800, 600)
         self.query_engine = query_engine
+        self._history_snapshot = []  # entries as shown, most recent first
         self.create_widgets()
         
     def create_widgets(self):
@@ -1432,23 +1658,33 @@ class QueryHistoryDialog(BaseDialog):
         
     def refresh_history(self):
         """Refresh query history"""
-        # Clear tree
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        tree = self.tree
+        # Unmap the tree while it is rebuilt so Tk lays it out once
+        tree.pack_forget()
         
-        # Get history
-        history = self.query_engine.get_query_history()
-        history.reverse()  # Show most recent first
+        # Clear tree
+        tree.delete(*tree.get_children())
+        
+        # Get history, most recent first; open_in_editor indexes this snapshot
+        self._history_snapshot = list(reversed(self.query_engine.get_query_history()))
+        
+        # Format every row first, then insert them in a tight loop
+        fromtimestamp = datetime.fromtimestamp
+        rows = []
+        for i, entry in enumerate(self._history_snapshot, 1):
+            timestamp = fromtimestamp(entry['timestamp']).strftime('%Y-%m-%d %H:%M:%S')
+            query = entry['query']
+            query_preview = query[:80] + '...' if len(query) > 80 else query
+            rows.append((str(i), (timestamp, query_preview,
+                                  entry['result_count'],
+                                  f"{entry['execution_time']:.3f}")))
+        
+        insert = tree.insert
+        end = tk.END
+        for text, values in rows:
+            insert('', end, text=text, values=values)
         
-        from datetime import datetime
-        for i, entry in enumerate(history, 1):
-            timestamp = datetime.fromtimestamp(entry['timestamp']).strftime('%Y-%m-%d %H:%M:%S')
-            query_preview = entry['query'][:80] + '...' if len(entry['query']) > 80 else entry['query']
-            
-            self.tree.insert('', tk.END, text=str(i),
-                           values=(timestamp, query_preview, 
-                                  entry['result_count'], 
-                                  f"{entry['execution_time']:.3f}"))
+        tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
     
     def clear_history(self):
         """Clear query history"""
@@ -1470,13 +1706,11 @@ class QueryHistoryDialog(BaseDialog):
         # Get full query from history
         item = self.tree.item(selection[0])
         index = int(item['text']) - 1
-        history = self.query_engine.get_query_history()
-        history.reverse()
+        history = self._history_snapshot
         
         if 0 <= index < len(history):
             query = history[index]['query']
             # Open SPARQL editor with this query
-            from gui.dialogs import SPARQLEditorDialog
             SPARQLEditorDialog(self.dialog, self.query_engine, initial_query=query)
 
 class FindReplaceDialog(BaseDialog):
@@ -1485,6 +1719,7 @@ class FindReplaceDialog(BaseDialog):
     def __init__(self, parent, ontology):
         super().__init__(parent, "Find and Replace", 500, 400)
         self.ontology = ontology
+        self._find_queries = {}  # (search type, case sensitive) -> prepared query
         self.create_widgets()
         
     def create_widgets(self):
@@ -1550,65 +1785,83 @@ class FindReplaceDialog(BaseDialog):
         self.find_entry.bind('<Return>', lambda e: self.find_all())
         self.find_entry.focus()
     
-    def find_all(self):
-        """Find all occurrences"""
-        search_text = self.find_entry.get()
-        if not search_text:
-            messagebox.showwarning("Empty Search", "Please enter text to search for")
-            return
-        
-        case_sensitive = self.case_sensitive.get()
-        search_type = self.search_in.get()
-        
-        # Build query based on search type
+    def _find_query(self, search_type, case_sensitive):
+        """Prepare the query for a search type on first use"""
+        key = (search_type, case_sensitive)
+        if key in self._find_queries:
+            return self._find_queries[key]
+            
+        # Build query based on search type; the match is filtered inside
+        # SPARQL so only rows containing the bound ?needle come back
         if search_type == "names":
-            query = """
-            SELECT ?instance ?name
-            WHERE {
+            variables = ('instance', 'name')
+            pattern = """
                 ?instance rdf:type owl:NamedIndividual .
                 ?instance univ:name ?name .
-            }
             """
         elif search_type == "values":
-            query = """
-            SELECT ?instance ?prop ?value
-            WHERE {
+            variables = ('instance', 'prop', 'value')
+            pattern = """
                 ?instance rdf:type owl:NamedIndividual .
                 ?instance ?prop ?value .
                 FILTER (isLiteral(?value))
-            }
             """
         else:  # all
-            query = """
-            SELECT ?instance ?prop ?value
-            WHERE {
+            variables = ('instance', 'prop', 'value')
+            pattern = """
                 ?instance rdf:type owl:NamedIndividual .
                 ?instance ?prop ?value .
-            }
             """
         
-        results = self.ontology.query(query)
+        if case_sensitive:
+            test = "CONTAINS(STR(?{0}), ?needle)"
+        else:
+            test = "CONTAINS(LCASE(STR(?{0})), ?needle)"
+        match = " || ".join(test.format(var) for var in variables)
+        query = prepareQuery(f"""
+            SELECT {' '.join('?' + var for var in variables)}
+            WHERE {{
+                {pattern}
+                FILTER ({match})
+            }}
+            """, initNs=dict(_NS, univ=self.ontology.univ_ns))
+        self._find_queries[key] = query
+        return query
+        
+    def find_all(self):
+        """Find all occurrences"""
+        search_text = self.find_entry.get()
+        if not search_text:
+            messagebox.showwarning("Empty Search", "Please enter text to search for")
+            return
+        
+        case_sensitive = self.case_sensitive.get()
+        search_type = self.search_in.get()
+        
+        needle = search_text if case_sensitive else search_text.lower()
+        query = self._find_query(search_type, case_sensitive)
+        
+        results = self.ontology.query(query, initBindings={'needle': Literal(needle)})
         matches = []
         
+        # Report each matching column of the surviving rows
         for row in results:
-            for key, value in row.items():
+            row_dict = row.asdict()
+            for key, value in row_dict.items():
                 value_str = str(value)
-                if not case_sensitive:
-                    if search_text.lower() in value_str.lower():
-                        matches.append((str(row.get('instance', '')), key, value_str))
-                else:
-                    if search_text in value_str:
-                        matches.append((str(row.get('instance', '')), key, value_str))
+                if needle in (value_str if case_sensitive else value_str.lower()):
+                    matches.append((str(row_dict.get('instance', '')), key, value_str))
         
         # Display results
         self.results_text.delete(1.0, tk.END)
         if matches:
-            self.results_text.insert(1.0, f"Found {len(matches)} matches:\n\n")
+            parts = [f"Found {len(matches)} matches:\n\n"]
             for instance, prop, value in matches[:50]:  # Show first 50
-                instance_name = instance.split('#')[-1] if '#' in instance else instance
-                self.results_text.insert(tk.END, f"• {instance_name}: {prop} = {value}\n")
+                instance_name = instance.rpartition('#')[2]
+                parts.append(f"• {instance_name}: {prop} = {value}\n")
             if len(matches) > 50:
-                self.results_text.insert(tk.END, f"\n... and {len(matches) - 50} more matches")
+                parts.append(f"\n... and {len(matches) - 50} more matches")
+            self.results_text.insert(1.0, "".join(parts))
         else:
             self.results_text.insert(1.0, "No matches found.")
     
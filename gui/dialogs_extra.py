@@ -6,163 +6,12 @@ import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
 import json
 
-class QueryBuilderDialog:
-    """Visual SPARQL query builder dialog"""
-    
-    def __init__(self, parent, ontology):
-        self.parent = parent
-        self.ontology = ontology
-        self.dialog = tk.Toplevel(parent)
-        self.dialog.title("SPARQL Query Builder")
-        self.dialog.geometry("800x600")
-        self.dialog.transient(parent)
-        self.dialog.grab_set()
-        
-        self.create_widgets()
-        
-    def create_widgets(self):
-        """Create query builder widgets"""
-        main_frame = ttk.Frame(self.dialog, padding=10)
-        main_frame.pack(fill=tk.BOTH, expand=True)
-        
-        # Create notebook
-        notebook = ttk.Notebook(main_frame)
-        notebook.pack(fill=tk.BOTH, expand=True)
-        
-        # Visual builder tab
-        visual_frame = ttk.Frame(notebook)
-        notebook.add(visual_frame, text="Visual Builder")
-        self.create_visual_builder(visual_frame)
-        
-        # Template tab
-        template_frame = ttk.Frame(notebook)
-        notebook.add(template_frame, text="Templates")
-        self.create_template_tab(template_frame)
-        
-        # Preview tab
-        preview_frame = ttk.Frame(notebook)
-        notebook.add(preview_frame, text="Preview")
-        self.create_preview_tab(preview_frame)
-        
-        # Close button
-        ttk.Button(main_frame, text="Close",
-                  command=self.dialog.destroy).pack(pady=(10, 0))
-                  
-    def create_visual_builder(self, parent):
-        """Create visual query builder"""
-        # This would be a complex visual query builder
-        # For now, just show a placeholder
-        label = ttk.Label(parent, text="Visual Query Builder (Coming Soon)",
-                         font=('Arial', 12))
-        label.pack(expand=True)
-        
-    def create_template_tab(self, parent):
-        """Create template selection tab"""
-        from core.query_engine import QueryEngine
-        
-        text = tk.Text(parent, wrap=tk.WORD, font=('Courier', 10))
-        scrollbar = ttk.Scrollbar(parent, command=text.yview)
-        text.config(yscrollcommand=scrollbar.set)
-        
-        text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        
-        # Get common queries
-        query_engine = QueryEngine(self.ontology)
-        templates = query_engine.get_common_queries()
-        
-        content = "SPARQL QUERY TEMPLATES\n"
-        content += "=" * 40 + "\n\n"
-        
-        for name, query in templates.items():
-            display_name = ' '.join(word.capitalize() for word in name.split('_'))
-            content += f"{display_name}:\n"
-            content += "-" * 30 + "\n"
-            content += query + "\n\n"
-            
-        text.insert(1.0, content)
-        text.config(state=tk.DISABLED)
-        
-    def create_preview_tab(self, parent):
-        """Create query preview tab"""
-        # Query preview text
-        self.preview_text = tk.Text(parent, wrap=tk.NONE, font=('Courier', 10),
-                                   height=20)
-        scrollbar_y = ttk.Scrollbar(parent, command=self.preview_text.yview)
-        scrollbar_x = ttk.Scrollbar(parent, orient=tk.HORIZONTAL,
-                                   command=self.preview_text.xview)
-        
-        self.preview_text.config(yscrollcommand=scrollbar_y.set,
-                                xscrollcommand=scrollbar_x.set)
-        
-        self.preview_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar_y.pack(side=tk.LEFT, fill=tk.Y)
-        scrollbar_x.pack(side=tk.BOTTOM, fill=tk.X)
-        
-        # Set default query
-        default_query = """
-        # Example SPARQL Query
-        SELECT ?subject ?predicate ?object
-        WHERE {
-            ?subject ?predicate ?object .
-            FILTER (isURI(?object))
-        }
-        LIMIT 10
-        """
-        self.preview_text.insert(1.0, default_query)
+# Rendered Templates tab text; the common queries are literals, so it is
+# built on first use and shared by every dialog
+_template_content = None
 
-class ExamplesDialog:
-    """Examples and tutorials dialog"""
-    
-    def __init__(self, parent, query_engine):
-        self.parent = parent
-        self.query_engine = query_engine
-        self.dialog = tk.Toplevel(parent)
-        self.dialog.title("Examples and Tutorials")
-        self.dialog.geometry("700x500")
-        self.dialog.transient(parent)
-        self.dialog.grab_set()
-        
-        self.create_widgets()
-        
-    def create_widgets(self):
-        """Create examples dialog widgets"""
-        main_frame = ttk.Frame(self.dialog, padding=10)
-        main_frame.pack(fill=tk.BOTH, expand=True)
-        
-        # Create notebook
-        notebook = ttk.Notebook(main_frame)
-        notebook.pack(fill=tk.BOTH, expand=True)
-        
-        # Basic examples tab
-        basic_frame = ttk.Frame(notebook)
-        notebook.add(basic_frame, text="Basic Examples")
-        self.create_basic_examples(basic_frame)
-        
-        # Advanced examples tab
-        advanced_frame = ttk.Frame(notebook)
-        notebook.add(advanced_frame, text="Advanced Examples")
-        self.create_advanced_examples(advanced_frame)
-        
-        # Tutorial tab
-        tutorial_frame = ttk.Frame(notebook)
-        notebook.add(tutorial_frame, text="Tutorial")
-        self.create_tutorial(tutorial_frame)
-        
-        # Close button
-        ttk.Button(main_frame, text="Close",
-                  command=self.dialog.destroy).pack(pady=(10, 0))
-                  
-    def create_basic_examples(self, parent):
-        """Create basic examples tab"""
-        text = tk.Text(parent, wrap=tk.WORD, font=('Courier', 10))
-        scrollbar = ttk.Scrollbar(parent, command=text.yview)
-        text.config(yscrollcommand=scrollbar.set)
-        
-        text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        
-        examples = """
+# Static example, tutorial and preview text, built once at import
+_BASIC_EXAMPLES = """
         BASIC SPARQL EXAMPLES
         =====================
         
@@ -201,20 +50,8 @@ class ExamplesDialog:
             ?prereq univ:name ?prereqName .
         }
         """
-        
-        text.insert(1.0, examples)
-        text.config(state=tk.DISABLED)
-        
-    def create_advanced_examples(self, parent):
-        """Create advanced examples tab"""
-        text = tk.Text(parent, wrap=tk.WORD, font=('Courier', 10))
-        scrollbar = ttk.Scrollbar(parent, command=text.yview)
-        text.config(yscrollcommand=scrollbar.set)
-        
-        text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        
-        examples = """
+
+_ADVANCED_EXAMPLES = """
         ADVANCED SPARQL EXAMPLES
         ========================
         
@@ -255,20 +92,8 @@ class ExamplesDialog:
         }
         ORDER BY ?advisorName ?studentName
         """
-        
-        text.insert(1.0, examples)
-        text.config(state=tk.DISABLED)
-        
-    def create_tutorial(self, parent):
-        """Create tutorial tab"""
-        text = tk.Text(parent, wrap=tk.WORD, font=('Arial', 10))
-        scrollbar = ttk.Scrollbar(parent, command=text.yview)
-        text.config(yscrollcommand=scrollbar.set)
-        
-        text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        
-        tutorial = """
+
+_TUTORIAL = """
         SPARQL QUERY TUTORIAL
         =====================
         
@@ -346,8 +171,190 @@ class ExamplesDialog:
         - Use meaningful variable names
         - Comment complex queries
         """
+
+_DEFAULT_PREVIEW_QUERY = """
+        # Example SPARQL Query
+        SELECT ?subject ?predicate ?object
+        WHERE {
+            ?subject ?predicate ?object .
+            FILTER (isURI(?object))
+        }
+        LIMIT 10
+        """
+
+class QueryBuilderDialog:
+    """Visual SPARQL query builder dialog"""
+    
+    def __init__(self, parent, ontology):
+        self.parent = parent
+        self.ontology = ontology
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("SPARQL Query Builder")
+        self.dialog.geometry("800x600")
+        self.dialog.transient(parent)
+        self.dialog.grab_set()
+        
+        self.create_widgets()
+        
+    def create_widgets(self):
+        """Create query builder widgets"""
+        main_frame = ttk.Frame(self.dialog, padding=10)
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        
+        # Create notebook
+        notebook = ttk.Notebook(main_frame)
+        notebook.pack(fill=tk.BOTH, expand=True)
+        
+        # Visual builder tab
+        visual_frame = ttk.Frame(notebook)
+        notebook.add(visual_frame, text="Visual Builder")
+        self.create_visual_builder(visual_frame)
+        
+        # Template tab
+        template_frame = ttk.Frame(notebook)
+        notebook.add(template_frame, text="Templates")
+        self.create_template_tab(template_frame)
+        
+        # Preview tab
+        preview_frame = ttk.Frame(notebook)
+        notebook.add(preview_frame, text="Preview")
+        self.create_preview_tab(preview_frame)
+        
+        # Close button
+        ttk.Button(main_frame, text="Close",
+                  command=self.dialog.destroy).pack(pady=(10, 0))
+                  
+    def create_visual_builder(self, parent):
+        """Create visual query builder"""
+        # This would be a complex visual query builder
+        # For now, just show a placeholder
+        label = ttk.Label(parent, text="Visual Query Builder (Coming Soon)",
+                         font=('Arial', 12))
+        label.pack(expand=True)
+        
+    def create_template_tab(self, parent):
+        """Create template selection tab"""
+        from core.query_engine import QueryEngine
+        
+        text = tk.Text(parent, wrap=tk.WORD, font=('Courier', 10))
+        scrollbar = ttk.Scrollbar(parent, command=text.yview)
+        text.config(yscrollcommand=scrollbar.set)
+        
+        text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        # Render the common queries once and reuse the text on reopen
+        global _template_content
+        if _template_content is None:
+            templates = QueryEngine(self.ontology).get_common_queries()
+            
+            # Collect the sections and join them once rather than growing a string
+            parts = ["SPARQL QUERY TEMPLATES\n", "=" * 40 + "\n\n"]
+            
+            for name, query in templates.items():
+                display_name = ' '.join(word.capitalize() for word in name.split('_'))
+                parts.append(f"{display_name}:\n{'-' * 30}\n{query}\n\n")
+                
+            _template_content = "".join(parts)
+            
+        text.insert(1.0, _template_content)
+        text.config(state=tk.DISABLED)
+        
+    def create_preview_tab(self, parent):
+        """Create query preview tab"""
+        # Query preview text
+        self.preview_text = tk.Text(parent, wrap=tk.NONE, font=('Courier', 10),
+                                   height=20)
+        scrollbar_y = ttk.Scrollbar(parent, command=self.preview_text.yview)
+        scrollbar_x = ttk.Scrollbar(parent, orient=tk.HORIZONTAL,
+                                   command=self.preview_text.xview)
+        
+        self.preview_text.config(yscrollcommand=scrollbar_y.set,
+                                xscrollcommand=scrollbar_x.set)
+        
+        self.preview_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar_y.pack(side=tk.LEFT, fill=tk.Y)
+        scrollbar_x.pack(side=tk.BOTTOM, fill=tk.X)
+        
+        # Set default query
+        self.preview_text.insert(1.0, _DEFAULT_PREVIEW_QUERY)
+
+class ExamplesDialog:
+    """Examples and tutorials dialog"""
+    
+    def __init__(self, parent, query_engine):
+        self.parent = parent
+        self.query_engine = query_engine
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("Examples and Tutorials")
+        self.dialog.geometry("700x500")
+        self.dialog.transient(parent)
+        self.dialog.grab_set()
+        
+        self.create_widgets()
+        
+    def create_widgets(self):
+        """Create examples dialog widgets"""
+        main_frame = ttk.Frame(self.dialog, padding=10)
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        
+        # Create notebook
+        notebook = ttk.Notebook(main_frame)
+        notebook.pack(fill=tk.BOTH, expand=True)
+        
+        # Basic examples tab
+        basic_frame = ttk.Frame(notebook)
+        notebook.add(basic_frame, text="Basic Examples")
+        self.create_basic_examples(basic_frame)
+        
+        # Advanced examples tab
+        advanced_frame = ttk.Frame(notebook)
+        notebook.add(advanced_frame, text="Advanced Examples")
+        self.create_advanced_examples(advanced_frame)
+        
+        # Tutorial tab
+        tutorial_frame = ttk.Frame(notebook)
+        notebook.add(tutorial_frame, text="Tutorial")
+        self.create_tutorial(tutorial_frame)
+        
+        # Close button
+        ttk.Button(main_frame, text="Close",
+                  command=self.dialog.destroy).pack(pady=(10, 0))
+                  
+    def create_basic_examples(self, parent):
+        """Create basic examples tab"""
+        text = tk.Text(parent, wrap=tk.WORD, font=('Courier', 10))
+        scrollbar = ttk.Scrollbar(parent, command=text.yview)
+        text.config(yscrollcommand=scrollbar.set)
+        
+        text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        text.insert(1.0, _BASIC_EXAMPLES)
+        text.config(state=tk.DISABLED)
+        
+    def create_advanced_examples(self, parent):
+        """Create advanced examples tab"""
+        text = tk.Text(parent, wrap=tk.WORD, font=('Courier', 10))
+        scrollbar = ttk.Scrollbar(parent, command=text.yview)
+        text.config(yscrollcommand=scrollbar.set)
+        
+        text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        text.insert(1.0, _ADVANCED_EXAMPLES)
+        text.config(state=tk.DISABLED)
+        
+    def create_tutorial(self, parent):
+        """Create tutorial tab"""
+        text = tk.Text(parent, wrap=tk.WORD, font=('Arial', 10))
+        scrollbar = ttk.Scrollbar(parent, command=text.yview)
+        text.config(yscrollcommand=scrollbar.set)
+        
+        text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
-        text.insert(1.0, tutorial)
+        text.insert(1.0, _TUTORIAL)
         text.config(state=tk.DISABLED)
 
 class PreferencesDialog:
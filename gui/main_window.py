@@ -3,6 +3,7 @@ Main application window
 """
 
 import tkinter as tk
+import tkinter.font as tkfont
 from tkinter import ttk, messagebox
 import logging
 from datetime import datetime
@@ -71,6 +72,13 @@ class UniversityManagementApp:
         self.style = ttk.Style()
         self.style.theme_use('clam')
         
+        # Named fonts are resolved by Tk once and shared by every label that
+        # uses them; keep references so they are not deleted
+        self._named_fonts = [
+            tkfont.Font(self.root, font=Fonts.BODY, name=Fonts.BODY_NAME),
+            tkfont.Font(self.root, font=Fonts.HEADING, name=Fonts.HEADING_NAME)
+        ]
+        
         # Configure styles
         self.style.configure('Title.TLabel',
                            font=Fonts.TITLE,
@@ -231,7 +239,7 @@ class UniversityManagementApp:
         self.notebook.add(self.tabs['visualization'], text="Visualization")
         
         # Set tab change callback
-        self.notebook.bind('<<NotebookTabChanged>>', self.on_tab_changed)
+        self.notebook.bind('<<NotebookTabChanged>>', self.on_tab_changed, add='+')
         
     def create_toolbar(self, parent):
         """Create toolbar with common actions"""
@@ -302,9 +310,10 @@ class UniversityManagementApp:
         if hasattr(current_tab, 'on_tab_selected'):
             current_tab.on_tab_selected()
             
-    def update_status_bar(self):
+    def update_status_bar(self, stats=None):
         """Update status bar with current statistics"""
-        stats = self.ontology.get_statistics()
+        if stats is None:
+            stats = self.ontology.get_statistics()
         stats_text = f"Classes: {stats['classes']} | " \
                     f"Instances: {stats['instances']} | " \
                     f"Relationships: {stats['relationships']}"
@@ -333,23 +342,26 @@ class UniversityManagementApp:
     def save_ontology(self):
         """Save ontology"""
         from gui.dialogs import SaveOntologyDialog
-        SaveOntologyDialog(self.root, self.ontology)
-        self.status_label.config(text="Ontology saved")
+        SaveOntologyDialog(self.root, self.ontology,
+                           on_saved=lambda f: self.status_label.config(text="Ontology saved"))
         
     def save_ontology_as(self):
         """Save ontology with new filename"""
         from gui.dialogs import SaveOntologyDialog
-        SaveOntologyDialog(self.root, self.ontology, save_as=True)
-        self.status_label.config(text="Ontology saved as")
+        SaveOntologyDialog(self.root, self.ontology, save_as=True,
+                           on_saved=lambda f: self.status_label.config(text="Ontology saved as"))
         
     def load_ontology(self):
         """Load ontology from file"""
         from gui.dialogs import LoadOntologyDialog
-        if LoadOntologyDialog(self.root, self.ontology):
-            self.query_engine.clear_cache()
-            self.refresh_all_views()
-            self.status_label.config(text="Ontology loaded")
-            logger.info("Ontology loaded from file")
+        LoadOntologyDialog(self.root, self.ontology, on_loaded=self._on_ontology_loaded)
+        
+    def _on_ontology_loaded(self, filename):
+        """Refresh the views once a background load has finished"""
+        self.query_engine.clear_cache()
+        self.refresh_all_views()
+        self.status_label.config(text="Ontology loaded")
+        logger.info("Ontology loaded from file")
             
     def export_turtle(self):
         """Export as Turtle format"""
@@ -369,10 +381,10 @@ class UniversityManagementApp:
         export_ontology(self.ontology, 'xml')
         self.status_label.config(text="Exported as RDF/XML")
         
-    def open_add_instance(self):
-        """Open add instance dialog"""
+    def open_add_instance(self, kind=None):
+        """Open add instance dialog, preselecting the class kind if given"""
         from gui.dialogs import AddInstanceDialog
-        dialog = AddInstanceDialog(self.root, self.ontology)
+        dialog = AddInstanceDialog(self.root, self.ontology, class_name=kind)
         if dialog.result:
             self.refresh_all_views()
             
@@ -606,15 +618,17 @@ class UniversityManagementApp:
         from tkinter import filedialog, messagebox as mb
         import os
         from datetime import datetime
+        from data.import_export import write_ntriples
         
         try:
             # Suggest backup filename with timestamp
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            default_filename = f"ontology_backup_{timestamp}.ttl"
+            default_filename = f"ontology_backup_{timestamp}.nt"
             
             filename = filedialog.asksaveasfilename(
-                defaultextension=".ttl",
+                defaultextension=".nt",
                 filetypes=[
+                    ("N-Triples files", "*.nt"),
                     ("Turtle files", "*.ttl"),
                     ("RDF/XML files", "*.rdf"),
                     ("JSON-LD files", "*.jsonld"),
@@ -628,15 +642,19 @@ class UniversityManagementApp:
                 # Determine format from extension
                 ext = os.path.splitext(filename)[1].lower()
                 format_map = {
+                    '.nt': 'nt',
                     '.ttl': 'turtle',
                     '.rdf': 'xml',
                     '.xml': 'xml',
                     '.jsonld': 'json-ld',
                     '.json': 'json-ld'
                 }
-                format_type = format_map.get(ext, 'turtle')
+                format_type = format_map.get(ext, 'nt')
                 
-                self.ontology.save_ontology(filename, format=format_type)
+                if format_type == 'nt':
+                    write_ntriples(self.ontology, filename)
+                else:
+                    self.ontology.save_ontology(filename, format=format_type)
                 mb.showinfo("Backup Created", f"Backup saved to:\n{os.path.basename(filename)}")
                 self.status_label.config(text=f"Backup created: {os.path.basename(filename)}")
                 logger.info(f"Backup created: {filename}")
@@ -657,6 +675,7 @@ class UniversityManagementApp:
             
             filename = filedialog.askopenfilename(
                 filetypes=[
+                    ("N-Triples files", "*.nt"),
                     ("Turtle files", "*.ttl"),
                     ("RDF/XML files", "*.rdf"),
                     ("JSON-LD files", "*.jsonld"),
@@ -669,6 +688,7 @@ class UniversityManagementApp:
                 # Determine format from extension
                 ext = os.path.splitext(filename)[1].lower()
                 format_map = {
+                    '.nt': 'nt',
                     '.ttl': 'turtle',
                     '.rdf': 'xml',
                     '.xml': 'xml',
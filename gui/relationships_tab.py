@@ -396,13 +396,10 @@ class RelationshipsTab(ttk.Frame):
             try:
                 deleted_count = 0
                 for subject, predicate, object_ in relationships:
-                    # Remove the relationship
-                    subj_uri = self.app.ontology.univ_ns[subject]
-                    pred_uri = self.app.ontology.univ_ns[predicate]
-                    obj_uri = self.app.ontology.univ_ns[object_]
-                    
-                    self.app.ontology.graph.remove((subj_uri, pred_uri, obj_uri))
-                    deleted_count += 1
+                    # Remove the relationship through the ontology so its
+                    # version and statistics stay current
+                    if self.app.ontology.remove_relationship(subject, predicate, object_):
+                        deleted_count += 1
                     
                 self.refresh()
                 messagebox.showinfo("Success", 
@@ -18,6 +18,8 @@ class ToolTip:
         
     def show_tooltip(self, event=None):
         """Show tooltip"""
+        if not self.text:
+            return
         x, y, _, _ = self.widget.bbox("insert")
         x += self.widget.winfo_rootx() + 25
         y += self.widget.winfo_rooty() + 20
@@ -85,11 +87,11 @@ class StatWidget(ttk.Frame):
     def create_widgets(self):
         """Create stat widget"""
         # Value
-        value_label = tk.Label(self.tk_frame, text=str(self.value),
-                              font=('Helvetica', 24, 'bold'),
-                              background=self.color,
-                              foreground='white')
-        value_label.pack(pady=(10, 5))
+        self._value_label = tk.Label(self.tk_frame, text=str(self.value),
+                                    font=('Helvetica', 24, 'bold'),
+                                    background=self.color,
+                                    foreground='white')
+        self._value_label.pack(pady=(10, 5))
         
         # Title
         title_label = tk.Label(self.tk_frame, text=self.title,
@@ -101,6 +103,12 @@ class StatWidget(ttk.Frame):
         # Description tooltip
         if self.description:
             ToolTip(self.tk_frame, self.description)
+            
+    def update_value(self, value):
+        """Show a new value in the existing label"""
+        if value != self.value:
+            self.value = value
+            self._value_label.configure(text=str(value))
 
 class RecentActivityWidget(ttk.Frame):
     """Recent activity widget"""
@@ -108,6 +116,7 @@ class RecentActivityWidget(ttk.Frame):
     def __init__(self, parent):
         super().__init__(parent)
         self.activities = []
+        self._item_ids = []  # Tree item of each entry in self.activities
         self.create_widgets()
         
     def create_widgets(self):
@@ -136,15 +145,16 @@ class RecentActivityWidget(ttk.Frame):
         item_id = self.tree.insert('', 'end', text=activity,
                                   values=(time, details))
         self.activities.append((activity, details, time))
+        self._item_ids.append(item_id)
         
         # Keep only last 10 activities
         if len(self.activities) > 10:
-            oldest = self.tree.get_children()[0]
-            self.tree.delete(oldest)
+            self.tree.delete(self._item_ids.pop(0))
             self.activities.pop(0)
             
     def clear(self):
         """Clear all activities"""
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        if self._item_ids:
+            self.tree.delete(*self._item_ids)
+        self._item_ids.clear()
         self.activities.clear()
\ No newline at end of file